@@ -31,11 +31,15 @@ struct OpcodeAliasEntry {
 
 // clang-format off
 static const OpcodeAliasEntry kOpcodeAliases[] = {
-#include "game/opcode_aliases_generated.inc"
+#define OPCODE_EMIT_ALIASES
+#include "game/opcode_registry_generated.inc"
+#undef OPCODE_EMIT_ALIASES
 };
 
 static const OpcodeNameEntry kOpcodeNames[] = {
-#include "game/opcode_names_generated.inc"
+#define OPCODE_EMIT_NAMES
+#include "game/opcode_registry_generated.inc"
+#undef OPCODE_EMIT_NAMES
 };
 // clang-format on
 
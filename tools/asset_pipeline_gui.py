@@ -20,7 +20,8 @@ import tempfile
 import threading
 import time
 import zipfile
-from dataclasses import asdict, dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -107,7 +108,10 @@ class PipelineManager:
             return self._default_state()
 
     def save_state(self) -> None:
-        serializable = asdict(self.state)
+        # PackInfo only holds primitives, so shallow dicts serialize the same as
+        # dataclasses.asdict without its recursive deep copy.
+        serializable = dict(vars(self.state))
+        serializable["packs"] = [vars(p) for p in self.state.packs]
         STATE_FILE.write_text(json.dumps(serializable, indent=2), encoding="utf-8")
 
     def now_str(self) -> str:
@@ -155,18 +159,54 @@ class PipelineManager:
             return 0
         return sum(1 for p in root.rglob("*") if p.is_file())
 
+    def _count_installed(self, files: list[str], data_root: Path) -> int:
+        # Count files recorded during install instead of re-walking the pack dir.
+        prefix = os.path.join(os.path.abspath(data_root), "")
+        return sum(1 for f in files if os.path.abspath(f).startswith(prefix))
+
+    def _copy_tree(self, src: Path, dst: Path) -> list[str]:
+        """Copy src into a new dst directory and return the copied file paths."""
+        dst.mkdir(parents=True, exist_ok=False)
+        src_str = os.fspath(src)
+        dst_str = os.fspath(dst)
+        pairs: list[tuple[str, str]] = []
+        for dirpath, _dirnames, filenames in os.walk(src_str, followlinks=True):
+            rel = os.path.relpath(dirpath, src_str)
+            out_dir = dst_str if rel == "." else os.path.join(dst_str, rel)
+            os.makedirs(out_dir, exist_ok=True)
+            for name in filenames:
+                pairs.append((os.path.join(dirpath, name), os.path.join(out_dir, name)))
+
+        # shutil.copytree is very slow on Windows for large trees; prefer robocopy.
+        if platform.system().lower().startswith("win") and shutil.which("robocopy"):
+            result = subprocess.run(
+                ["robocopy", src_str, dst_str, "/E", "/NFL", "/NDL", "/NJH", "/NJS", "/MT:16"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            # robocopy exit codes below 8 mean success.
+            if result.returncode < 8:
+                return [out for _, out in pairs]
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(lambda pair: shutil.copy2(*pair), pairs))
+        return [out for _, out in pairs]
+
     def install_pack_from_zip(self, zip_path: Path) -> PackInfo:
         pack_name = zip_path.stem
         pack_id = self._normalize_id(pack_name)
         target = self._pack_dir(pack_id)
         target.mkdir(parents=True, exist_ok=False)
 
+        installed: list[str] = []
         with zipfile.ZipFile(zip_path, "r") as zf:
             for member in zf.infolist():
                 member_path = (target / member.filename).resolve()
                 if not str(member_path).startswith(str(target.resolve()) + "/") and member_path != target.resolve():
                     raise ValueError(f"Zip slip detected: {member.filename!r} escapes target directory")
                 zf.extract(member, target)
+                if not member.is_dir():
+                    installed.append(str(member_path))
 
         data_root = self.find_data_root(target)
         info = PackInfo(
@@ -175,7 +215,7 @@ class PipelineManager:
             source=str(zip_path),
             installed_dir=str(target),
             installed_at=self.now_str(),
-            file_count=self._count_files(data_root),
+            file_count=self._count_installed(installed, data_root.resolve()),
         )
         self.state.packs.append(info)
         self.save_state()
@@ -185,7 +225,7 @@ class PipelineManager:
         pack_name = folder_path.name
         pack_id = self._normalize_id(pack_name)
         target = self._pack_dir(pack_id)
-        shutil.copytree(folder_path, target)
+        installed = self._copy_tree(folder_path, target)
 
         data_root = self.find_data_root(target)
         info = PackInfo(
@@ -194,7 +234,7 @@ class PipelineManager:
             source=str(folder_path),
             installed_dir=str(target),
             installed_at=self.now_str(),
-            file_count=self._count_files(data_root),
+            file_count=self._count_installed(installed, data_root),
         )
         self.state.packs.append(info)
         self.save_state()
@@ -367,6 +407,7 @@ class AssetPipelineGUI:
         self.proc_thread: threading.Thread | None = None
         self.proc_process: subprocess.Popen | None = None
         self.proc_running = False
+        self._state_view_text: str | None = None
 
         self.root.title("WoWee Asset Pipeline")
         self.root.geometry("1120x760")
@@ -1929,12 +1970,13 @@ class AssetPipelineGUI:
 
     def refresh_pack_list(self) -> None:
         prev_sel = self.pack_list.curselection()
-        active = self.manager.state.active_pack_ids
+        active_pos = {pid: i for i, pid in enumerate(self.manager.state.active_pack_ids)}
         self.pack_list.delete(0, tk.END)
         for pack in self.manager.state.packs:
             marker = ""
-            if pack.pack_id in active:
-                marker = f"[active #{active.index(pack.pack_id) + 1}] "
+            pos = active_pos.get(pack.pack_id)
+            if pos is not None:
+                marker = f"[active #{pos + 1}] "
             self.pack_list.insert(tk.END, f"{marker}{pack.name}")
         # Restore previous selection if still valid.
         for idx in prev_sel:
@@ -1952,10 +1994,10 @@ class AssetPipelineGUI:
             self.pack_detail.configure(state="disabled")
             return
 
-        active = "yes" if pack.pack_id in self.manager.state.active_pack_ids else "no"
-        order = "-"
-        if pack.pack_id in self.manager.state.active_pack_ids:
-            order = str(self.manager.state.active_pack_ids.index(pack.pack_id) + 1)
+        active_pos = {pid: i for i, pid in enumerate(self.manager.state.active_pack_ids)}
+        pos = active_pos.get(pack.pack_id)
+        active = "yes" if pos is not None else "no"
+        order = "-" if pos is None else str(pos + 1)
         lines = [
             f"Name: {pack.name}",
             f"Active: {active}",
@@ -2182,9 +2224,13 @@ class AssetPipelineGUI:
             ]
         )
 
+        text = "\n".join(lines)
+        if text == self._state_view_text:
+            return
+        self._state_view_text = text
         self.state_text.configure(state="normal")
         self.state_text.delete("1.0", tk.END)
-        self.state_text.insert(tk.END, "\n".join(lines))
+        self.state_text.insert("1.0", text)
         self.state_text.configure(state="disabled")
 
 
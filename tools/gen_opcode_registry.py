@@ -8,86 +8,232 @@ Inputs:
 
 Outputs:
 - include/game/opcode_enum_generated.inc
-- include/game/opcode_names_generated.inc
-- include/game/opcode_aliases_generated.inc
+- include/game/opcode_registry_generated.inc
+
+The enum fragment stays on its own because opcode_table.hpp is included almost
+everywhere; only opcode_table.cpp needs the tables. The registry bundle holds the
+two table sections, selected by the includer with OPCODE_EMIT_NAMES or
+OPCODE_EMIT_ALIASES.
+
+With --legacy the tables are written as the previous separate fragments instead
+(include/game/opcode_{names,aliases}_generated.inc).
+
+Generation is skipped when the inputs and this script are unchanged since the
+last run (tracked in include/game/.opcode_registry.stamp), and outputs whose
+content is unchanged are not rewritten.
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 import re
+import string
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from operator import itemgetter
 from pathlib import Path
-
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    import json_stream
+    from json_stream.base import StreamingJSONList, StreamingJSONObject
+    HAS_JSON_STREAM = True
+except ImportError:
+    HAS_JSON_STREAM = False
+
+# Reference definition of a valid opcode name; is_valid_name() implements the
+# same check without going through the regex engine.
 RE_NAME = re.compile(r"^(?:CMSG|SMSG|MSG)_[A-Z0-9_]+$")
+_NAME_STRIP = str.maketrans("", "", string.ascii_uppercase + string.digits + "_")
+HEADER_BYTES = b"// GENERATED FILE - DO NOT EDIT\n\n"
+
+LIST_TYPES: tuple[type, ...] = (list, StreamingJSONList) if HAS_JSON_STREAM else (list,)
+OBJECT_TYPES: tuple[type, ...] = (dict, StreamingJSONObject) if HAS_JSON_STREAM else (dict,)
+
+# Decoded inputs keyed by (kind, path, mtime_ns, size), so repeated calls in one
+# process (e.g. from a build orchestrator) skip re-parsing unchanged files.
+_CACHE: dict[tuple[str, str, int, int], Any] = {}
+
+
+def _cache_key(kind: str, path: Path) -> tuple[str, str, int, int]:
+    st = path.stat()
+    return (kind, str(path), st.st_mtime_ns, st.st_size)
+
+
+# Files smaller than this are parsed in one shot (orjson when installed), which is
+# faster than streaming; larger ones are streamed to bound memory.
+STREAM_MIN_BYTES = 1 << 20
+
+
+@contextmanager
+def open_section(path: Path, key: str, default: Any) -> Iterator[Any]:
+    """Yield data[key] from a JSON file, streamed when it is large and json_stream is available."""
+    if not HAS_JSON_STREAM or path.stat().st_size < STREAM_MIN_BYTES:
+        yield _loads(path.read_bytes()).get(key, default)
+        return
+    with path.open("rb") as f:
+        data = json_stream.load(f)
+        try:
+            section = data[key]
+        except KeyError:
+            section = default
+        yield section
 
 
-def load_canonical(path: Path) -> list[str]:
-    data = json.loads(path.read_text())
-    names = data.get("logical_opcodes", [])
-    if not isinstance(names, list):
-        raise ValueError("canonical.json: logical_opcodes must be a list")
+def is_valid_name(name: str) -> bool:
+    if name.startswith(("CMSG_", "SMSG_")):
+        prefix = 5
+    elif name.startswith("MSG_"):
+        prefix = 4
+    else:
+        return False
+    return len(name) > prefix and not name.translate(_NAME_STRIP)
+
+
+def load_canonical(path: Path) -> tuple[tuple[str, ...], frozenset[str]]:
+    key = _cache_key("canonical", path)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+
     out: list[str] = []
     seen: set[str] = set()
-    for raw in names:
-        if not isinstance(raw, str) or not RE_NAME.match(raw):
-            raise ValueError(f"Invalid canonical opcode name: {raw!r}")
-        if raw in seen:
-            continue
-        seen.add(raw)
-        out.append(raw)
-    return out
-
-
-def load_aliases(path: Path, canonical: set[str]) -> dict[str, str]:
-    data = json.loads(path.read_text())
-    aliases = data.get("aliases", {})
-    if not isinstance(aliases, dict):
-        raise ValueError("aliases.json: aliases must be an object")
-    out: dict[str, str] = {}
-    for alias, target in sorted(aliases.items()):
-        if not isinstance(alias, str) or not RE_NAME.match(alias):
-            raise ValueError(f"Invalid alias opcode name: {alias!r}")
-        if not isinstance(target, str) or not RE_NAME.match(target):
-            raise ValueError(f"Invalid alias target opcode name: {target!r}")
+    valid = is_valid_name
+    seen_add = seen.add
+    out_append = out.append
+    with open_section(path, "logical_opcodes", []) as names:
+        if not isinstance(names, LIST_TYPES):
+            raise ValueError("canonical.json: logical_opcodes must be a list")
+        for raw in names:
+            if not isinstance(raw, str) or not valid(raw):
+                raise ValueError(f"Invalid canonical opcode name: {raw!r}")
+            if raw in seen:
+                continue
+            seen_add(raw)
+            out_append(raw)
+    result = (tuple(out), frozenset(seen))
+    _CACHE[key] = result
+    return result
+
+
+def load_aliases(path: Path, canonical: frozenset[str]) -> Mapping[str, str]:
+    key = _cache_key("aliases", path)
+    out = _CACHE.get(key)
+    if out is None:
+        with open_section(path, "aliases", {}) as aliases:
+            if not isinstance(aliases, OBJECT_TYPES):
+                raise ValueError("aliases.json: aliases must be an object")
+            items = list(aliases.items())
+        out = {}
+        valid = is_valid_name
+        for alias, target in sorted(items, key=itemgetter(0)):
+            if not isinstance(alias, str) or not valid(alias):
+                raise ValueError(f"Invalid alias opcode name: {alias!r}")
+            if not isinstance(target, str) or not valid(target):
+                raise ValueError(f"Invalid alias target opcode name: {target!r}")
+            out[alias] = target
+        _CACHE[key] = out
+
+    # The canonical set can differ between calls, so always check targets.
+    for alias, target in out.items():
         if target not in canonical:
             raise ValueError(f"Alias target not in canonical set: {alias} -> {target}")
-        out[alias] = target
-    return out
+    return MappingProxyType(out)
 
 
-def write_file(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content)
+def write_file(path: Path, content: bytes) -> None:
+    # Leave identical outputs untouched so their mtimes don't trigger rebuilds.
+    if path.exists() and path.read_bytes() == content:
+        return
+    path.write_bytes(content)
+
+
+def inputs_digest(paths: list[Path], mode: str) -> str:
+    h = hashlib.sha256(mode.encode("ascii"))
+    for path in paths:
+        h.update(path.read_bytes())
+    return h.hexdigest()
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Emit the old three-file layout instead of the enum fragment + table bundle.",
+    )
+    args = parser.parse_args()
+
     root = Path(__file__).resolve().parent.parent
     data_dir = root / "Data/opcodes"
     inc_dir = root / "include/game"
+    if args.legacy:
+        outputs = [
+            inc_dir / "opcode_enum_generated.inc",
+            inc_dir / "opcode_names_generated.inc",
+            inc_dir / "opcode_aliases_generated.inc",
+        ]
+        out_label = "include/game/opcode_*_generated.inc"
+    else:
+        outputs = [
+            inc_dir / "opcode_enum_generated.inc",
+            inc_dir / "opcode_registry_generated.inc",
+        ]
+        out_label = "include/game/opcode_{enum,registry}_generated.inc"
+    stamp = inc_dir / ".opcode_registry.stamp"
+
+    digest = inputs_digest(
+        [data_dir / "canonical.json", data_dir / "aliases.json", Path(__file__).resolve()],
+        "legacy" if args.legacy else "bundle",
+    )
+    if stamp.exists() and stamp.read_text().strip() == digest and all(p.exists() for p in outputs):
+        print(f"generated: up-to-date -> {out_label}")
+        return 0
 
-    canonical_names = load_canonical(data_dir / "canonical.json")
-    canonical_set = set(canonical_names)
+    canonical_names, canonical_set = load_canonical(data_dir / "canonical.json")
     aliases = load_aliases(data_dir / "aliases.json", canonical_set)
 
-    enum_lines = ["// GENERATED FILE - DO NOT EDIT", ""]
-    enum_lines += [f"    {name}," for name in canonical_names]
-    enum_content = "\n".join(enum_lines) + "\n"
-
-    name_lines = ["// GENERATED FILE - DO NOT EDIT", ""]
-    name_lines += [f'    {{"{name}", LogicalOpcode::{name}}},' for name in canonical_names]
-    names_content = "\n".join(name_lines) + "\n"
-
-    alias_lines = ["// GENERATED FILE - DO NOT EDIT", ""]
-    alias_lines += [f'    {{"{alias}", "{target}"}},' for alias, target in aliases.items()]
-    aliases_content = "\n".join(alias_lines) + "\n"
-
-    write_file(inc_dir / "opcode_enum_generated.inc", enum_content)
-    write_file(inc_dir / "opcode_names_generated.inc", names_content)
-    write_file(inc_dir / "opcode_aliases_generated.inc", aliases_content)
+    # Enum and name table come from the same list; fill both in one pass.
+    enum_buf = bytearray()
+    names_buf = bytearray()
+    for name in canonical_names:
+        nb = name.encode("ascii")
+        enum_buf += b"    " + nb + b",\n"
+        names_buf += b'    {"' + nb + b'", LogicalOpcode::' + nb + b"},\n"
+    aliases_body = "".join('    {"%s", "%s"},\n' % kv for kv in aliases.items()).encode("utf-8")
+
+    if args.legacy:
+        contents = [
+            HEADER_BYTES + enum_buf,
+            HEADER_BYTES + names_buf,
+            HEADER_BYTES + aliases_body,
+        ]
+    else:
+        contents = [
+            HEADER_BYTES + enum_buf,
+            HEADER_BYTES
+            + b"#ifdef OPCODE_EMIT_NAMES\n" + names_buf + b"#endif\n\n"
+            + b"#ifdef OPCODE_EMIT_ALIASES\n" + aliases_body + b"#endif\n",
+        ]
+
+    inc_dir.mkdir(parents=True, exist_ok=True)
+    # The writes are independent; overlap them (the GIL is released during I/O).
+    with ThreadPoolExecutor(max_workers=len(outputs)) as pool:
+        list(pool.map(write_file, outputs, [bytes(c) for c in contents]))
+    stamp.write_text(digest + "\n")
 
     print(
         f"generated: canonical={len(canonical_names)} aliases={len(aliases)} "
-        f"-> include/game/opcode_*_generated.inc"
+        f"-> {out_label}"
     )
     return 0
 
@@ -7,28 +7,64 @@ Supports textured rendering, skeletal animation playback, and orbit camera contr
 
 from __future__ import annotations
 
+import ctypes
 import hashlib
+import json
 import math
+import mmap
 import multiprocessing
 import os
 import shutil
 import struct
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 import numpy as np
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 # ---------------------------------------------------------------------------
 # Matrix math utilities (pure NumPy, no external 3D lib needed)
 # ---------------------------------------------------------------------------
 
-def perspective(fov_deg: float, aspect: float, near: float, far: float) -> np.ndarray:
+def _aligned_empty(shape: tuple[int, ...], dtype: Any, align: int = 64) -> np.ndarray:
+    """Uninitialized C-contiguous array whose data starts on an `align`-byte boundary."""
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    raw = np.empty(nbytes + align, dtype=np.uint8)
+    start = -raw.ctypes.data % align
+    return raw[start:start + nbytes].view(dtype).reshape(shape)
+
+
+def _mat4_out(out: np.ndarray | None, identity: bool) -> np.ndarray:
+    """Target 4x4 float32 matrix: a fresh one, or `out` reset in place."""
+    if out is None:
+        return np.eye(4, dtype=np.float32) if identity else np.zeros((4, 4), dtype=np.float32)
+    out[:] = 0.0
+    if identity:
+        np.fill_diagonal(out, 1.0)
+    return out
+
+
+# Both viewers draw their model untransformed; shared, never written to
+_MODEL_IDENTITY = np.eye(4, dtype=np.float32)
+_MODEL_IDENTITY.flags.writeable = False
+
+
+def perspective(fov_deg: float, aspect: float, near: float, far: float,
+                out: np.ndarray | None = None) -> np.ndarray:
     f = 1.0 / math.tan(math.radians(fov_deg) / 2.0)
-    m = np.zeros((4, 4), dtype=np.float32)
+    m = _mat4_out(out, identity=False)
     m[0, 0] = f / aspect
     m[1, 1] = f
     m[2, 2] = (far + near) / (near - far)
@@ -37,13 +73,14 @@ def perspective(fov_deg: float, aspect: float, near: float, far: float) -> np.nd
     return m
 
 
-def look_at(eye: np.ndarray, target: np.ndarray, up: np.ndarray) -> np.ndarray:
+def look_at(eye: np.ndarray, target: np.ndarray, up: np.ndarray,
+            out: np.ndarray | None = None) -> np.ndarray:
     f = target - eye
     f = f / np.linalg.norm(f)
     s = np.cross(f, up)
     s = s / (np.linalg.norm(s) + 1e-12)
     u = np.cross(s, f)
-    m = np.eye(4, dtype=np.float32)
+    m = _mat4_out(out, identity=True)
     m[0, :3] = s
     m[1, :3] = u
     m[2, :3] = -f
@@ -53,59 +90,135 @@ def look_at(eye: np.ndarray, target: np.ndarray, up: np.ndarray) -> np.ndarray:
     return m
 
 
-def translate(tx: float, ty: float, tz: float) -> np.ndarray:
-    m = np.eye(4, dtype=np.float32)
-    m[0, 3] = tx
-    m[1, 3] = ty
-    m[2, 3] = tz
-    return m
-
-
-def scale_mat4(sx: float, sy: float, sz: float) -> np.ndarray:
-    m = np.eye(4, dtype=np.float32)
-    m[0, 0] = sx
-    m[1, 1] = sy
-    m[2, 2] = sz
-    return m
-
-
-def quat_to_mat4(q: np.ndarray) -> np.ndarray:
-    """Quaternion (x,y,z,w) to 4x4 rotation matrix."""
-    x, y, z, w = q
-    m = np.eye(4, dtype=np.float32)
-    m[0, 0] = 1 - 2 * (y * y + z * z)
-    m[0, 1] = 2 * (x * y - z * w)
-    m[0, 2] = 2 * (x * z + y * w)
-    m[1, 0] = 2 * (x * y + z * w)
-    m[1, 1] = 1 - 2 * (x * x + z * z)
-    m[1, 2] = 2 * (y * z - x * w)
-    m[2, 0] = 2 * (x * z - y * w)
-    m[2, 1] = 2 * (y * z + x * w)
-    m[2, 2] = 1 - 2 * (x * x + y * y)
-    return m
+# Above this |dot| slerp_batch uses normalized lerp; the angular error stays well under a degree
+SLERP_LERP_THRESHOLD = 0.995
 
 
-def slerp(q0: np.ndarray, q1: np.ndarray, t: float) -> np.ndarray:
-    dot = np.dot(q0, q1)
-    if dot < 0:
-        q1 = -q1
-        dot = -dot
-    dot = min(dot, 1.0)
-    if dot > 0.9995:
-        result = q0 + t * (q1 - q0)
-        return result / np.linalg.norm(result)
-    theta = math.acos(dot)
-    sin_theta = math.sin(theta)
-    a = math.sin((1 - t) * theta) / sin_theta
-    b = math.sin(t * theta) / sin_theta
-    result = a * q0 + b * q1
-    return result / np.linalg.norm(result)
+def slerp_batch(q0: np.ndarray, q1: np.ndarray, t: np.ndarray,
+                out: np.ndarray | None = None) -> np.ndarray:
+    """Vectorized slerp over stacked quaternion pairs: q0, q1 (N,4), t (N,)."""
+    dot = np.einsum('ij,ij->i', q0, q1)
+    sign = np.where(dot < 0, -1.0, 1.0).astype(np.float32)
+    q1 = q1 * sign[:, None]
+    dot = np.minimum(dot * sign, 1.0)
+    linear = dot > SLERP_LERP_THRESHOLD
+    theta = np.arccos(dot)
+    sin_theta = np.where(linear, 1.0, np.sin(theta))
+    a = np.where(linear, 1.0 - t, np.sin((1.0 - t) * theta) / sin_theta)
+    b = np.where(linear, t, np.sin(t * theta) / sin_theta)
+    result = np.add(a[:, None] * q0, b[:, None] * q1, out=out)
+    # An all-zero key (e.g. compressed 32767s) stays zero, which the bone matrix reads as identity
+    norms = np.sqrt(np.einsum('ij,ij->i', result, result))
+    np.maximum(norms, 1e-10, out=norms)
+    result /= norms[:, None]
+    return result
 
 
 # ---------------------------------------------------------------------------
 # M2 Parser
 # ---------------------------------------------------------------------------
 
+# Precompiled little-endian struct formats shared by the M2 and WMO parsers
+_SH = struct.Struct("<H")
+_SI = struct.Struct("<I")
+_S2h = struct.Struct("<hh")
+_S4H = struct.Struct("<4H")
+_S2I = struct.Struct("<II")
+_S4I = struct.Struct("<IIII")
+# IFF-style chunk header: 4-byte tag + uint32 payload size (WMO), both read as uint32
+_CHUNK_HDR = struct.Struct("<II")
+
+# M2Vertex: pos(3f) + bone weights(4B) + bone indices(4B) + normal(3f) + uv0(2f) + uv1(2f)
+_VERTEX_DTYPE = np.dtype([
+    ("pos", "<f4", (3,)),
+    ("bone_weights", "u1", (4,)),
+    ("bone_indices", "u1", (4,)),
+    ("normal", "<f4", (3,)),
+    ("uv", "<f4", (2,)),
+    ("uv2", "<f4", (2,)),
+])
+
+# M2Array header {count, offset}; also the layout of a vanilla M2Range {start, end}
+_ARRAY_HDR_DTYPE = np.dtype([("count", "<u4"), ("offset", "<u4")])
+
+# M2Sequence (WotLK, 64 bytes): duration is stored directly
+_ANIM_DTYPE_WOTLK = np.dtype([
+    ("anim_id", "<u2"),
+    ("variation", "<u2"),
+    ("duration", "<u4"),
+    ("speed", "<f4"),
+    ("flags", "<u4"),
+    ("rest", "V48"),
+])
+
+# M2Sequence (Vanilla, 68 bytes): start/end timestamps instead of a duration
+_ANIM_DTYPE_VANILLA = np.dtype([
+    ("anim_id", "<u2"),
+    ("variation", "<u2"),
+    ("start", "<u4"),
+    ("end", "<u4"),
+    ("speed", "<f4"),
+    ("flags", "<u4"),
+    ("rest", "V48"),
+])
+
+# M2CompBone (WotLK, 88 bytes): submeshId + boneNameCRC, then three 20-byte tracks
+_BONE_DTYPE_WOTLK = np.dtype([
+    ("key_bone_id", "<i4"),
+    ("flags", "<u4"),
+    ("parent", "<i2"),
+    ("submesh_id", "<u2"),
+    ("name_crc", "<u4"),
+    ("tracks", "V60"),
+    ("pivot", "<f4", (3,)),
+])
+
+# M2CompBone (Vanilla, 108 bytes): no boneNameCRC, three 28-byte tracks
+_BONE_DTYPE_VANILLA = np.dtype([
+    ("key_bone_id", "<i4"),
+    ("flags", "<u4"),
+    ("parent", "<i2"),
+    ("submesh_id", "<u2"),
+    ("tracks", "V84"),
+    ("pivot", "<f4", (3,)),
+])
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _resolve_indices(triangles: np.ndarray, vertex_lookup: np.ndarray, n_verts: int) -> np.ndarray:
+        """Triangle idx -> vertex_lookup -> global vertex idx (0 when out of range)."""
+        out = np.zeros(len(triangles), dtype=np.uint16)
+        n_lookup = len(vertex_lookup)
+        for i in range(len(triangles)):
+            tri_idx = triangles[i]
+            if tri_idx < n_lookup:
+                global_idx = vertex_lookup[tri_idx]
+                if global_idx < n_verts:
+                    out[i] = global_idx
+        return out
+else:
+    def _resolve_indices(triangles: np.ndarray, vertex_lookup: np.ndarray, n_verts: int) -> np.ndarray:
+        """Triangle idx -> vertex_lookup -> global vertex idx (0 when out of range)."""
+        in_range = triangles < len(vertex_lookup)
+        global_idx = vertex_lookup[np.where(in_range, triangles, 0)]
+        return np.where(in_range & (global_idx < n_verts), global_idx, 0).astype(np.uint16)
+
+
+def resolve_bone_influences(bone_indices: np.ndarray, bone_lookup: list[int],
+                            n_bones: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-vertex lookup slots -> global bone indices (n, 4) plus a validity mask.
+
+    Invalid influences (lookup or bone out of range) map to bone 0 and must get zero weight.
+    """
+    lookup_arr = np.array(bone_lookup, dtype=np.int32)
+    bi = bone_indices.astype(np.int32)
+    valid = bi < len(lookup_arr)
+    global_bones = lookup_arr[np.where(valid, bi, 0)]
+    valid &= global_bones < n_bones
+    return np.where(valid, global_bones, 0), valid
+
+
 @dataclass
 class M2Track:
     """Parsed animation track with per-sequence timestamps and keyframes."""
@@ -113,6 +226,7 @@ class M2Track:
     global_sequence: int = -1
     timestamps: list[np.ndarray] = field(default_factory=list)  # list of uint32 arrays per seq
     keys: list[np.ndarray] = field(default_factory=list)        # list of value arrays per seq
+    has_data: bool = False  # any non-empty key array; False means sampling yields the default
 
 
 @dataclass
@@ -149,12 +263,26 @@ class M2Animation:
     flags: int = 0
 
 
+def _map_file(path: str | os.PathLike) -> mmap.mmap | bytes:
+    """Read-only memory map of a file; np.frombuffer over it references file pages directly."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 class M2Parser:
-    """Parse M2 binary data for rendering: vertices, UVs, normals, bones, skins, textures."""
+    """Parse M2 binary data for rendering: vertices, UVs, normals, bones, skins, textures.
 
-    def __init__(self, data: bytes):
+    Accepts the file contents or a path; a path is memory-mapped for the parser's lifetime.
+    """
+
+    def __init__(self, data: bytes | str | os.PathLike):
+        if isinstance(data, (str, os.PathLike)):
+            data = _map_file(data)
         self.data = data
-        self.version = struct.unpack_from("<I", data, 4)[0]
+        self.skin_data: bytes | mmap.mmap | memoryview = b""
+        self.version = _SI.unpack_from(data, 4)[0]
         self.is_vanilla = self.version <= 256
 
         # Parsed data
@@ -174,6 +302,9 @@ class M2Parser:
         self.texture_lookup: list[int] = []
         self.bone_lookup: list[int] = []
         self.bones: list[M2Bone] = []
+        self.bone_parents: np.ndarray = np.empty(0, dtype=np.int32)       # SoA copies of bone data
+        self.bone_pivots: np.ndarray = np.empty((0, 3), dtype=np.float32)  # for the bone kernels
+        self.bone_order: np.ndarray = np.empty(0, dtype=np.int32)         # parents before children
         self.animations: list[M2Animation] = []
         self.global_sequences: list[int] = []
 
@@ -203,7 +334,7 @@ class M2Parser:
         return table[field_name]
 
     def _read_u32(self, offset: int) -> int:
-        return struct.unpack_from("<I", self.data, offset)[0]
+        return _SI.unpack_from(self.data, offset)[0]
 
     def _read_m2array(self, field_name: str) -> tuple[int, int]:
         """Read count, offset for an M2Array header field."""
@@ -227,33 +358,20 @@ class M2Parser:
         n, ofs = self._read_m2array("GlobalSeq")
         if n == 0 or n > 10000 or ofs + n * 4 > len(self.data):
             return
-        self.global_sequences = list(struct.unpack_from(f"<{n}I", self.data, ofs))
+        self.global_sequences = np.frombuffer(self.data, dtype="<u4", count=n, offset=ofs).tolist()
 
     def _parse_vertices(self):
         n, ofs = self._read_m2array("Verts")
         if n == 0 or n > 500000 or ofs + n * 48 > len(self.data):
             return
 
-        # Parse all vertex fields using numpy for speed
-        positions = np.empty((n, 3), dtype=np.float32)
-        normals = np.empty((n, 3), dtype=np.float32)
-        uvs = np.empty((n, 2), dtype=np.float32)
-        bone_weights = np.empty((n, 4), dtype=np.uint8)
-        bone_indices = np.empty((n, 4), dtype=np.uint8)
-
-        for i in range(n):
-            base = ofs + i * 48
-            positions[i] = struct.unpack_from("<3f", self.data, base)
-            bone_weights[i] = struct.unpack_from("<4B", self.data, base + 12)
-            bone_indices[i] = struct.unpack_from("<4B", self.data, base + 16)
-            normals[i] = struct.unpack_from("<3f", self.data, base + 20)
-            uvs[i] = struct.unpack_from("<2f", self.data, base + 32)
-
-        self.positions = positions
-        self.normals = normals
-        self.uvs = uvs
-        self.bone_weights = bone_weights
-        self.bone_indices = bone_indices
+        # One structured view over all 48-byte vertices, then split into SoA arrays
+        verts = np.frombuffer(self.data, dtype=_VERTEX_DTYPE, count=n, offset=ofs)
+        self.positions = np.ascontiguousarray(verts["pos"])
+        self.normals = np.ascontiguousarray(verts["normal"])
+        self.uvs = np.ascontiguousarray(verts["uv"])
+        self.bone_weights = np.ascontiguousarray(verts["bone_weights"])
+        self.bone_indices = np.ascontiguousarray(verts["bone_indices"])
 
     def _parse_textures(self):
         n, ofs = self._read_m2array("Textures")
@@ -261,8 +379,8 @@ class M2Parser:
             return
         for i in range(n):
             base = ofs + i * 16
-            tex_type, tex_flags = struct.unpack_from("<II", self.data, base)
-            name_len, name_ofs = struct.unpack_from("<II", self.data, base + 8)
+            tex_type, tex_flags = _S2I.unpack_from(self.data, base)
+            name_len, name_ofs = _S2I.unpack_from(self.data, base + 8)
             filename = ""
             if tex_type == 0 and name_len > 1 and name_ofs + name_len <= len(self.data):
                 raw = self.data[name_ofs:name_ofs + name_len]
@@ -273,101 +391,116 @@ class M2Parser:
         n, ofs = self._read_m2array("TextureLookup")
         if n == 0 or n > 10000 or ofs + n * 2 > len(self.data):
             return
-        self.texture_lookup = list(struct.unpack_from(f"<{n}H", self.data, ofs))
+        self.texture_lookup = np.frombuffer(self.data, dtype="<u2", count=n, offset=ofs).tolist()
 
     def _parse_bone_lookup(self):
         n, ofs = self._read_m2array("BoneLookup")
         if n == 0 or n > 10000 or ofs + n * 2 > len(self.data):
             return
-        self.bone_lookup = list(struct.unpack_from(f"<{n}H", self.data, ofs))
+        self.bone_lookup = np.frombuffer(self.data, dtype="<u2", count=n, offset=ofs).tolist()
 
     def _parse_animations(self):
         n, ofs = self._read_m2array("Anims")
         if n == 0 or n > 5000:
             return
-        seq_size = 68 if self.is_vanilla else 64
-        if ofs + n * seq_size > len(self.data):
+        anim_dtype = _ANIM_DTYPE_VANILLA if self.is_vanilla else _ANIM_DTYPE_WOTLK
+        if ofs + n * anim_dtype.itemsize > len(self.data):
             return
-        for i in range(n):
-            base = ofs + i * seq_size
-            anim_id, variation = struct.unpack_from("<HH", self.data, base)
-            if self.is_vanilla:
-                start_ts, end_ts = struct.unpack_from("<II", self.data, base + 4)
-                duration = end_ts - start_ts
-                speed = struct.unpack_from("<f", self.data, base + 12)[0]
-                flags = struct.unpack_from("<I", self.data, base + 16)[0]
-            else:
-                duration = struct.unpack_from("<I", self.data, base + 4)[0]
-                speed = struct.unpack_from("<f", self.data, base + 8)[0]
-                flags = struct.unpack_from("<I", self.data, base + 12)[0]
-            self.animations.append(M2Animation(
-                anim_id=anim_id, variation=variation,
-                duration=duration, speed=speed, flags=flags,
-            ))
+        arr = np.frombuffer(self.data, dtype=anim_dtype, count=n, offset=ofs)
+        if self.is_vanilla:
+            durations = (arr["end"].astype(np.int64) - arr["start"]).tolist()
+        else:
+            durations = arr["duration"].tolist()
+        self.animations = [
+            M2Animation(anim_id=a, variation=v, duration=d, speed=sp, flags=f)
+            for a, v, d, sp, f in zip(arr["anim_id"].tolist(), arr["variation"].tolist(), durations,
+                                      arr["speed"].tolist(), arr["flags"].tolist())
+        ]
 
-    def _parse_track_wotlk(self, base: int, key_size: int, key_dtype: str) -> M2Track:
-        """Parse a WotLK M2TrackDisk (20 bytes) at given offset."""
+    # Track timestamps and raw (vec3/float/C4Quaternion) keys are read-only views that
+    # alias self.data — do not mutate. Only decoded compressed quaternions own their memory.
+
+    def _array_headers(self, n: int, ofs: int) -> list[tuple[int, int]]:
+        """(count, offset) of n consecutive M2Array headers; headers past EOF get an invalid count."""
+        n_valid = min(n, max(0, (len(self.data) - ofs) // 8))
+        hdrs = []
+        if n_valid > 0:
+            hdrs = np.frombuffer(self.data, dtype=_ARRAY_HDR_DTYPE, count=n_valid, offset=ofs).tolist()
+        return hdrs + [(0xFFFFFFFF, 0)] * (n - n_valid)
+
+    def _vec3_keys(self, count: int, ofs: int) -> np.ndarray:
+        return np.frombuffer(self.data, dtype=np.float32, count=count * 3, offset=ofs).reshape(count, 3)
+
+    def _float_keys(self, count: int, ofs: int) -> np.ndarray:
+        return np.frombuffer(self.data, dtype=np.float32, count=count, offset=ofs)
+
+    def _compressed_quat_keys(self, count: int, ofs: int) -> np.ndarray:
+        raw = np.frombuffer(self.data, dtype=np.int16, count=count * 4, offset=ofs).reshape(count, 4)
+        # Decompress: (v < 0 ? v+32768 : v-32767) / 32767.0, branchless:
+        # v/32767 - 1 - sign*(65535/32767) where sign = v >> 15 is 0 or -1
+        sign = (raw >> 15).astype(np.float32)
+        result = raw.astype(np.float32)
+        result *= np.float32(1.0 / 32767.0)
+        result -= np.float32(1.0)
+        result -= sign * np.float32(65535.0 / 32767.0)
+        # Normalize each quaternion in place
+        norms = np.sqrt(np.einsum('ij,ij->i', result, result))
+        np.maximum(norms, 1e-10, out=norms)
+        result /= norms[:, np.newaxis]
+        return result
+
+    def _parse_track_wotlk(self, base: int, key_size: int,
+                           read_keys: Callable[[int, int], np.ndarray]) -> M2Track:
+        """Parse a WotLK M2TrackDisk (20 bytes) at given offset, decoding keys with read_keys."""
         track = M2Track()
         if base + 20 > len(self.data):
             return track
-        interp, global_seq = struct.unpack_from("<hh", self.data, base)
-        n_ts, ofs_ts, n_keys, ofs_keys = struct.unpack_from("<IIII", self.data, base + 4)
+        interp, global_seq = _S2h.unpack_from(self.data, base)
+        n_ts, ofs_ts, n_keys, ofs_keys = _S4I.unpack_from(self.data, base + 4)
         track.interp = interp
         track.global_sequence = global_seq
 
         if n_ts > 5000 or n_keys > 5000:
             return track
 
-        # Each entry in n_ts is a sub-array header: {count(4), offset(4)}
-        for s in range(n_ts):
-            ts_hdr = ofs_ts + s * 8
-            if ts_hdr + 8 > len(self.data):
-                track.timestamps.append(np.empty(0, dtype=np.uint32))
-                continue
-            sub_count, sub_ofs = struct.unpack_from("<II", self.data, ts_hdr)
-            if sub_count > 50000 or sub_ofs + sub_count * 4 > len(self.data):
+        # Each entry in n_ts / n_keys is a sub-array header: {count(4), offset(4)}
+        data_len = len(self.data)
+        for sub_count, sub_ofs in self._array_headers(n_ts, ofs_ts):
+            if sub_count > 50000 or sub_ofs + sub_count * 4 > data_len:
                 track.timestamps.append(np.empty(0, dtype=np.uint32))
                 continue
-            ts_data = np.frombuffer(self.data, dtype=np.uint32, count=sub_count, offset=sub_ofs)
-            track.timestamps.append(ts_data.copy())
+            track.timestamps.append(np.frombuffer(self.data, dtype=np.uint32, count=sub_count, offset=sub_ofs))
 
-        for s in range(n_keys):
-            key_hdr = ofs_keys + s * 8
-            if key_hdr + 8 > len(self.data):
-                track.keys.append(np.empty(0, dtype=np.float32))
-                continue
-            sub_count, sub_ofs = struct.unpack_from("<II", self.data, key_hdr)
-            if sub_count > 50000 or sub_ofs + sub_count * key_size > len(self.data):
+        for sub_count, sub_ofs in self._array_headers(n_keys, ofs_keys):
+            if sub_count > 50000 or sub_ofs + sub_count * key_size > data_len:
                 track.keys.append(np.empty(0, dtype=np.float32))
                 continue
-            if key_dtype == "compressed_quat":
-                raw = np.frombuffer(self.data, dtype=np.int16, count=sub_count * 4, offset=sub_ofs)
-                raw = raw.reshape(sub_count, 4).astype(np.float32)
-                # Decompress: (v < 0 ? v+32768 : v-32767) / 32767.0
-                result = np.where(raw < 0, raw + 32768.0, raw - 32767.0) / 32767.0
-                # Normalize each quaternion
-                norms = np.linalg.norm(result, axis=1, keepdims=True)
-                norms = np.maximum(norms, 1e-10)
-                result = result / norms
-                track.keys.append(result)
-            elif key_dtype == "vec3":
-                vals = np.frombuffer(self.data, dtype=np.float32, count=sub_count * 3, offset=sub_ofs)
-                track.keys.append(vals.reshape(sub_count, 3).copy())
-            elif key_dtype == "float":
-                vals = np.frombuffer(self.data, dtype=np.float32, count=sub_count, offset=sub_ofs)
-                track.keys.append(vals.copy())
+            track.keys.append(read_keys(sub_count, sub_ofs))
 
+        track.has_data = any(len(k) > 0 for k in track.keys)
         return track
 
-    def _parse_track_vanilla(self, base: int, key_size: int, key_dtype: str) -> M2Track:
-        """Parse a Vanilla M2TrackDiskVanilla (28 bytes) — flat arrays with M2Range indexing."""
+    def _parse_track_wotlk_vec3(self, base: int) -> M2Track:
+        return self._parse_track_wotlk(base, 12, self._vec3_keys)
+
+    def _parse_track_wotlk_quat(self, base: int) -> M2Track:
+        return self._parse_track_wotlk(base, 8, self._compressed_quat_keys)
+
+    def _parse_track_wotlk_float(self, base: int) -> M2Track:
+        return self._parse_track_wotlk(base, 4, self._float_keys)
+
+    def _parse_track_vanilla(self, base: int, n_comp: int) -> M2Track:
+        """Parse a Vanilla M2TrackDiskVanilla (28 bytes) — flat arrays with M2Range indexing.
+
+        Keys are uncompressed float32 with n_comp components (3 = vec3, 4 = C4Quaternion, 1 = float).
+        """
         track = M2Track()
         if base + 28 > len(self.data):
             return track
-        interp, global_seq = struct.unpack_from("<hh", self.data, base)
-        n_ranges, ofs_ranges = struct.unpack_from("<II", self.data, base + 4)
-        n_ts, ofs_ts = struct.unpack_from("<II", self.data, base + 12)
-        n_keys, ofs_keys = struct.unpack_from("<II", self.data, base + 20)
+        interp, global_seq = _S2h.unpack_from(self.data, base)
+        n_ranges, ofs_ranges = _S2I.unpack_from(self.data, base + 4)
+        n_ts, ofs_ts = _S2I.unpack_from(self.data, base + 12)
+        n_keys, ofs_keys = _S2I.unpack_from(self.data, base + 20)
         track.interp = interp
         track.global_sequence = global_seq
 
@@ -377,33 +510,22 @@ class M2Parser:
         # Read flat timestamp array
         all_ts = np.empty(0, dtype=np.uint32)
         if n_ts > 0 and ofs_ts + n_ts * 4 <= len(self.data):
-            all_ts = np.frombuffer(self.data, dtype=np.uint32, count=n_ts, offset=ofs_ts).copy()
+            all_ts = np.frombuffer(self.data, dtype=np.uint32, count=n_ts, offset=ofs_ts)
 
         # Read flat key array
-        if key_dtype == "c4quat":
-            all_keys_flat = np.empty(0, dtype=np.float32)
-            if n_keys > 0 and ofs_keys + n_keys * 16 <= len(self.data):
-                all_keys_flat = np.frombuffer(self.data, dtype=np.float32, count=n_keys * 4, offset=ofs_keys)
-                all_keys_flat = all_keys_flat.reshape(n_keys, 4).copy()
-        elif key_dtype == "vec3":
-            all_keys_flat = np.empty((0, 3), dtype=np.float32)
-            if n_keys > 0 and ofs_keys + n_keys * 12 <= len(self.data):
-                all_keys_flat = np.frombuffer(self.data, dtype=np.float32, count=n_keys * 3, offset=ofs_keys)
-                all_keys_flat = all_keys_flat.reshape(n_keys, 3).copy()
-        else:
-            all_keys_flat = np.empty(0, dtype=np.float32)
-            if n_keys > 0 and ofs_keys + n_keys * key_size <= len(self.data):
-                all_keys_flat = np.frombuffer(self.data, dtype=np.float32, count=n_keys, offset=ofs_keys).copy()
+        all_keys_flat = np.empty((0, 3) if n_comp == 3 else 0, dtype=np.float32)
+        if n_keys > 0 and ofs_keys + n_keys * n_comp * 4 <= len(self.data):
+            all_keys_flat = np.frombuffer(self.data, dtype=np.float32, count=n_keys * n_comp, offset=ofs_keys)
+            if n_comp > 1:
+                all_keys_flat = all_keys_flat.reshape(n_keys, n_comp)
 
         # Read ranges and split into per-sequence arrays
         if n_ranges > 0 and n_ranges < 5000 and ofs_ranges + n_ranges * 8 <= len(self.data):
-            for r in range(n_ranges):
-                rng_start, rng_end = struct.unpack_from("<II", self.data, ofs_ranges + r * 8)
+            ranges = np.frombuffer(self.data, dtype=_ARRAY_HDR_DTYPE, count=n_ranges, offset=ofs_ranges)
+            for rng_start, rng_end in ranges.tolist():
                 if rng_end > rng_start and rng_end <= len(all_ts):
                     track.timestamps.append(all_ts[rng_start:rng_end])
-                    if key_dtype in ("c4quat", "vec3") and rng_end <= len(all_keys_flat):
-                        track.keys.append(all_keys_flat[rng_start:rng_end])
-                    elif rng_end <= len(all_keys_flat):
+                    if rng_end <= len(all_keys_flat):
                         track.keys.append(all_keys_flat[rng_start:rng_end])
                     else:
                         track.keys.append(np.empty(0, dtype=np.float32))
@@ -416,55 +538,85 @@ class M2Parser:
                 track.timestamps.append(all_ts)
                 track.keys.append(all_keys_flat if len(all_keys_flat) > 0 else np.empty(0, dtype=np.float32))
 
+        track.has_data = any(len(k) > 0 for k in track.keys)
         return track
 
+    def _parse_track_vanilla_vec3(self, base: int) -> M2Track:
+        return self._parse_track_vanilla(base, 3)
+
+    def _parse_track_vanilla_quat(self, base: int) -> M2Track:
+        return self._parse_track_vanilla(base, 4)
+
     def _parse_bones(self):
         n, ofs = self._read_m2array("Bones")
         if n == 0 or n > 5000:
             return
 
+        # Track parsers are picked once per model, not per track or per key
         if self.is_vanilla:
-            bone_size = 108  # No boneNameCRC, 28-byte tracks: 4+4+2+2+3×28+12=108
-            for i in range(n):
-                base = ofs + i * bone_size
-                if base + bone_size > len(self.data):
-                    break
-                bone = M2Bone()
-                bone.key_bone_id = struct.unpack_from("<i", self.data, base)[0]
-                bone.flags = struct.unpack_from("<I", self.data, base + 4)[0]
-                bone.parent = struct.unpack_from("<h", self.data, base + 8)[0]
-                # submeshId at +10 (2 bytes), then 3 vanilla tracks at +12, each 28 bytes
-                bone.translation = self._parse_track_vanilla(base + 12, 12, "vec3")
-                bone.rotation = self._parse_track_vanilla(base + 40, 16, "c4quat")
-                bone.scale = self._parse_track_vanilla(base + 68, 12, "vec3")
-                # pivot at 12 + 3×28 = 96
-                bone.pivot = np.array(struct.unpack_from("<3f", self.data, base + 96), dtype=np.float32)
-                self.bones.append(bone)
+            bone_dtype, track_ofs, track_size = _BONE_DTYPE_VANILLA, 12, 28
+            parse_vec3, parse_quat = self._parse_track_vanilla_vec3, self._parse_track_vanilla_quat
         else:
-            bone_size = 88  # WotLK with boneNameCRC
-            for i in range(n):
-                base = ofs + i * bone_size
-                if base + bone_size > len(self.data):
-                    break
-                bone = M2Bone()
-                bone.key_bone_id = struct.unpack_from("<i", self.data, base)[0]
-                bone.flags = struct.unpack_from("<I", self.data, base + 4)[0]
-                bone.parent = struct.unpack_from("<h", self.data, base + 8)[0]
-                # submeshId(2) + boneNameCRC(4) = 6 more bytes before tracks
-                # Tracks start at base+16, each 20 bytes
-                bone.translation = self._parse_track_wotlk(base + 16, 12, "vec3")
-                bone.rotation = self._parse_track_wotlk(base + 36, 8, "compressed_quat")
-                bone.scale = self._parse_track_wotlk(base + 56, 12, "vec3")
-                bone.pivot = np.array(struct.unpack_from("<3f", self.data, base + 76), dtype=np.float32)
-                self.bones.append(bone)
+            bone_dtype, track_ofs, track_size = _BONE_DTYPE_WOTLK, 16, 20
+            parse_vec3, parse_quat = self._parse_track_wotlk_vec3, self._parse_track_wotlk_quat
+        bone_size = bone_dtype.itemsize
+        n = min(n, max(0, (len(self.data) - ofs) // bone_size))
+        if n == 0:
+            return
+
+        arr = np.frombuffer(self.data, dtype=bone_dtype, count=n, offset=ofs)
+        self.bone_parents = arr["parent"].astype(np.int32)
+        self.bone_pivots = np.ascontiguousarray(arr["pivot"])
+        key_bone_ids = arr["key_bone_id"].tolist()
+        flags = arr["flags"].tolist()
+        parents = self.bone_parents.tolist()
+
+        # Only the tracks (variable-length sub-arrays) still need per-bone parsing
+        for i in range(n):
+            base = ofs + i * bone_size + track_ofs
+            self.bones.append(M2Bone(
+                key_bone_id=key_bone_ids[i],
+                flags=flags[i],
+                parent=parents[i],
+                pivot=self.bone_pivots[i],
+                translation=parse_vec3(base),
+                rotation=parse_quat(base + track_size),
+                scale=parse_vec3(base + 2 * track_size),
+            ))
+        self.bone_order = self._topo_bone_order()
+
+    def _topo_bone_order(self) -> np.ndarray:
+        """Bone indices ordered so every parent is evaluated before its children."""
+        n = len(self.bones)
+        children: list[list[int]] = [[] for _ in range(n)]
+        roots: list[int] = []
+        for i, parent in enumerate(self.bone_parents.tolist()):
+            if 0 <= parent < n and parent != i:
+                children[parent].append(i)
+            else:
+                roots.append(i)
+        order: list[int] = []
+        stack = roots[::-1]
+        while stack:
+            i = stack.pop()
+            order.append(i)
+            stack.extend(reversed(children[i]))
+        if len(order) < n:
+            # Bones caught in a parent cycle: fall back to index order for those
+            placed = set(order)
+            order.extend(i for i in range(n) if i not in placed)
+        return np.array(order, dtype=np.int32)
 
     def _parse_skin(self):
         """Parse skin file (external .skin or embedded for vanilla)."""
         # This will be called externally with skin data
         pass
 
-    def parse_skin_data(self, skin_data: bytes):
-        """Parse skin file binary data for vertex lookup, triangles, submeshes, batches."""
+    def parse_skin_data(self, skin_data: bytes | memoryview | str | os.PathLike):
+        """Parse skin file binary data (or a path to map) for vertex lookup, triangles, submeshes, batches."""
+        if isinstance(skin_data, (str, os.PathLike)):
+            skin_data = _map_file(skin_data)
+        self.skin_data = skin_data
         if len(skin_data) < 48:
             return
 
@@ -472,11 +624,11 @@ class M2Parser:
         if skin_data[:4] == b"SKIN":
             off = 4
 
-        n_indices, ofs_indices = struct.unpack_from("<II", skin_data, off + 0)
-        n_tris, ofs_tris = struct.unpack_from("<II", skin_data, off + 8)
+        n_indices, ofs_indices = _S2I.unpack_from(skin_data, off + 0)
+        n_tris, ofs_tris = _S2I.unpack_from(skin_data, off + 8)
         # Properties at +16
-        n_submeshes, ofs_submeshes = struct.unpack_from("<II", skin_data, off + 24)
-        n_batches, ofs_batches = struct.unpack_from("<II", skin_data, off + 32)
+        n_submeshes, ofs_submeshes = _S2I.unpack_from(skin_data, off + 24)
+        n_batches, ofs_batches = _S2I.unpack_from(skin_data, off + 32)
 
         if n_indices == 0 or n_indices > 500000:
             return
@@ -497,14 +649,7 @@ class M2Parser:
         # This matches the C++ approach: model.indices stores global vertex indices
         if len(self.triangles) > 0 and len(self.vertex_lookup) > 0:
             n_verts = len(self.positions) if len(self.positions) > 0 else 65536
-            resolved = np.zeros(len(self.triangles), dtype=np.uint16)
-            for i, tri_idx in enumerate(self.triangles):
-                if tri_idx < len(self.vertex_lookup):
-                    global_idx = self.vertex_lookup[tri_idx]
-                    resolved[i] = global_idx if global_idx < n_verts else 0
-                else:
-                    resolved[i] = 0
-            self.resolved_indices = resolved
+            self.resolved_indices = _resolve_indices(self.triangles, self.vertex_lookup, n_verts)
 
         # Submeshes (WotLK: 48 bytes, Vanilla: 32 bytes)
         submesh_size = 32 if self.is_vanilla else 48
@@ -514,10 +659,8 @@ class M2Parser:
                 sm = M2Submesh()
                 # WotLK M2SkinSection: +0=skinSectionId(2), +2=Level(2),
                 # +4=vertexStart(2), +6=vertexCount(2), +8=indexStart(2), +10=indexCount(2)
-                sm.vertex_start = struct.unpack_from("<H", skin_data, base + 4)[0]
-                sm.vertex_count = struct.unpack_from("<H", skin_data, base + 6)[0]
-                sm.index_start = struct.unpack_from("<H", skin_data, base + 8)[0]
-                sm.index_count = struct.unpack_from("<H", skin_data, base + 10)[0]
+                (sm.vertex_start, sm.vertex_count,
+                 sm.index_start, sm.index_count) = _S4H.unpack_from(skin_data, base + 4)
                 self.submeshes.append(sm)
 
         # Batches (24 bytes each)
@@ -528,8 +671,8 @@ class M2Parser:
                 # M2Batch: flags(1) + priority(1) + shaderId(2) + skinSectionIndex(2)
                 # + geosetIndex(2) + colorIndex(2) + materialIndex(2) + materialLayer(2)
                 # + textureCount(2) + textureComboIndex(2) + ...
-                batch.submesh_index = struct.unpack_from("<H", skin_data, base + 4)[0]
-                batch.texture_combo_index = struct.unpack_from("<H", skin_data, base + 16)[0]
+                batch.submesh_index = _SH.unpack_from(skin_data, base + 4)[0]
+                batch.texture_combo_index = _SH.unpack_from(skin_data, base + 16)[0]
                 self.batches.append(batch)
 
 
@@ -537,6 +680,69 @@ class M2Parser:
 # Animation System
 # ---------------------------------------------------------------------------
 
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _eval_bones(order: np.ndarray, parents: np.ndarray, pivots: np.ndarray, trans: np.ndarray,
+                    rots: np.ndarray, scales: np.ndarray, out: np.ndarray) -> None:
+        """Build each local T(p+t)*R(q)*S(s)*T(-p) in closed form and chain it onto its parent."""
+        n = len(parents)
+        local = np.empty((4, 4), dtype=np.float32)
+        tmp = np.empty((4, 4), dtype=np.float32)
+        for k in range(len(order)):
+            i = order[k]
+            x, y, z, w = rots[i, 0], rots[i, 1], rots[i, 2], rots[i, 3]
+            sx, sy, sz = scales[i, 0], scales[i, 1], scales[i, 2]
+            px, py, pz = pivots[i, 0], pivots[i, 1], pivots[i, 2]
+
+            local[0, 0] = (1 - 2 * (y * y + z * z)) * sx
+            local[0, 1] = 2 * (x * y - z * w) * sy
+            local[0, 2] = 2 * (x * z + y * w) * sz
+            local[1, 0] = 2 * (x * y + z * w) * sx
+            local[1, 1] = (1 - 2 * (x * x + z * z)) * sy
+            local[1, 2] = 2 * (y * z - x * w) * sz
+            local[2, 0] = 2 * (x * z - y * w) * sx
+            local[2, 1] = 2 * (y * z + x * w) * sy
+            local[2, 2] = (1 - 2 * (x * x + y * y)) * sz
+            for r in range(3):
+                local[r, 3] = (pivots[i, r] + trans[i, r]
+                               - (local[r, 0] * px + local[r, 1] * py + local[r, 2] * pz))
+            local[3, 0] = 0.0
+            local[3, 1] = 0.0
+            local[3, 2] = 0.0
+            local[3, 3] = 1.0
+
+            p = parents[i]
+            if p >= 0 and p < n:
+                for r in range(4):
+                    for c in range(4):
+                        tmp[r, c] = (out[p, r, 0] * local[0, c] + out[p, r, 1] * local[1, c]
+                                     + out[p, r, 2] * local[2, c] + out[p, r, 3] * local[3, c])
+                out[i] = tmp
+            else:
+                out[i] = local
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _skin_positions(positions: np.ndarray, bone_weights: np.ndarray, global_bones: np.ndarray,
+                        valid: np.ndarray, bone_flat: np.ndarray, out: np.ndarray) -> None:
+        """Blend up to 4 bone transforms per vertex and de-homogenize into out (n, 3)."""
+        for i in prange(positions.shape[0]):
+            px, py, pz = positions[i, 0], positions[i, 1], positions[i, 2]
+            rx = ry = rz = rw = np.float32(0.0)
+            for v in range(4):
+                if not valid[i, v]:
+                    continue
+                w = np.float32(bone_weights[i, v]) / np.float32(255.0)
+                m = bone_flat[global_bones[i, v]]
+                rx += w * (m[0] * px + m[1] * py + m[2] * pz + m[3])
+                ry += w * (m[4] * px + m[5] * py + m[6] * pz + m[7])
+                rz += w * (m[8] * px + m[9] * py + m[10] * pz + m[11])
+                rw += w * (m[12] * px + m[13] * py + m[14] * pz + m[15])
+            if abs(rw) <= 0.001:
+                rw = np.float32(1.0)
+            out[i, 0] = rx / rw
+            out[i, 1] = ry / rw
+            out[i, 2] = rz / rw
+
 _ANIM_NAMES: dict[int, str] = {
     0: "Stand", 1: "Death", 2: "Spell", 3: "Stop", 4: "Walk", 5: "Run",
     6: "Dead", 7: "Rise", 8: "StandWound", 9: "CombatWound", 10: "CombatCritical",
@@ -556,24 +762,56 @@ class AnimationSystem:
     def __init__(self, parser: M2Parser):
         self.parser = parser
         self.bone_matrices: np.ndarray = np.empty(0)
+        # Backing store for bone_matrices: one 64-byte row (= one cache line) per bone
+        self._bone_flat: np.ndarray = np.empty((0, 16), dtype=np.float32)
         self.current_seq: int = 0
         self.playing: bool = True
         self.speed: float = 1.0
         self.time_ms: float = 0.0
+        self._pose: tuple[int, float] | None = None  # (sequence, time) bone_matrices hold
         self._identity = np.eye(4, dtype=np.float32)
+        self._local = np.eye(4, dtype=np.float32)  # scratch for _local_matrix
+
+        # Per-frame sampled bone channels, fed to the Numba bone kernel
+        n_bones = len(parser.bones)
+        self._trans = np.zeros((n_bones, 3), dtype=np.float32)
+        self._rots = np.zeros((n_bones, 4), dtype=np.float32)
+        self._scales = np.ones((n_bones, 3), dtype=np.float32)
+        # Rotation keyframe pairs gathered across bones for one slerp_batch call
+        self._q0 = np.zeros((n_bones, 4), dtype=np.float32)
+        self._q1 = np.zeros((n_bones, 4), dtype=np.float32)
+        self._qt = np.zeros(n_bones, dtype=np.float32)
+        # Last keyframe segment found per timestamp array; playback usually stays in
+        # the same segment or advances by one between frames.
+        self._last_key: dict[int, int] = {}
+
+        # Skinning scratch buffers, sized on first use by _skin_buffers()
+        self._pos4: np.ndarray | None = None
+        self._skin_weights = np.empty((0, 4), dtype=np.float32)
+        self._skin_mats = np.empty((0, 4, 4, 4), dtype=np.float32)
+        self._skin_transformed = np.empty((0, 4, 4), dtype=np.float32)
+        self._skin_result = np.empty((0, 4), dtype=np.float32)
+        self._skin_out = np.empty((0, 3), dtype=np.float32)
 
     def set_sequence(self, idx: int):
         self.current_seq = max(0, min(idx, len(self.parser.animations) - 1))
         self.time_ms = 0.0
 
-    def update(self, dt: float):
-        """Advance animation time and compute bone matrices."""
+    def update(self, dt: float) -> bool:
+        """Advance animation time and compute bone matrices.
+
+        Returns False when the pose is unchanged since the last call (paused, zero
+        speed, no animations), in which case bone_matrices are left as they were.
+        """
         if not self.parser.bones:
-            return
+            return False
 
         n_bones = len(self.parser.bones)
         if len(self.bone_matrices) == 0:
-            self.bone_matrices = np.tile(self._identity, (n_bones, 1, 1)).copy()
+            self._bone_flat = _aligned_empty((n_bones, 16), np.float32)
+            self._bone_flat[:] = self._identity.ravel()
+            self.bone_matrices = self._bone_flat.reshape(n_bones, 4, 4)
+            self._pose = None
 
         if self.playing and self.parser.animations:
             anim = self.parser.animations[self.current_seq]
@@ -583,27 +821,59 @@ class AnimationSystem:
 
         seq_idx = self.current_seq
         t = self.time_ms
-
-        for i, bone in enumerate(self.parser.bones):
-            local = self._eval_bone(bone, seq_idx, t)
-            if bone.parent >= 0 and bone.parent < n_bones:
-                self.bone_matrices[i] = self.bone_matrices[bone.parent] @ local
+        # Bone matrices are a pure function of (sequence, time)
+        if self._pose == (seq_idx, t):
+            return False
+        self._pose = (seq_idx, t)
+
+        self._sample_bones(seq_idx, t)
+        order = self.parser.bone_order
+        if HAS_NUMBA:
+            _eval_bones(order, self.parser.bone_parents, self.parser.bone_pivots,
+                        self._trans, self._rots, self._scales, self.bone_matrices)
+            return True
+
+        bones = self.parser.bones
+        for i in order.tolist():
+            parent = bones[i].parent
+            local = self._local_matrix(i)
+            if parent >= 0 and parent < n_bones:
+                np.matmul(self.bone_matrices[parent], local, out=self.bone_matrices[i])
             else:
                 self.bone_matrices[i] = local
+        return True
 
-    def _eval_bone(self, bone: M2Bone, seq_idx: int, time_ms: float) -> np.ndarray:
-        """Compute local bone transform for one bone at given time."""
-        trans = self._interp_vec3(bone.translation, seq_idx, time_ms, np.zeros(3, dtype=np.float32))
-        rot = self._interp_quat(bone.rotation, seq_idx, time_ms)
-        scl = self._interp_vec3(bone.scale, seq_idx, time_ms, np.ones(3, dtype=np.float32))
-
-        # local = T(pivot) * T(trans) * R(rot) * S(scl) * T(-pivot)
-        p = bone.pivot
-        m = translate(p[0], p[1], p[2])
-        m = m @ translate(trans[0], trans[1], trans[2])
-        m = m @ quat_to_mat4(rot)
-        m = m @ scale_mat4(scl[0], scl[1], scl[2])
-        m = m @ translate(-p[0], -p[1], -p[2])
+    def _sample_bones(self, seq_idx: int, time_ms: float):
+        """Sample every bone's translation, rotation and scale tracks at given time."""
+        zero = np.zeros(3, dtype=np.float32)
+        one = np.ones(3, dtype=np.float32)
+        identity = np.array([0, 0, 0, 1], dtype=np.float32)
+        for i, bone in enumerate(self.parser.bones):
+            # Most bones leave some channels unanimated; skip the track lookup for those
+            tr, rot, scl = bone.translation, bone.rotation, bone.scale
+            self._trans[i] = self._interp_vec3(tr, seq_idx, time_ms, zero) if tr.has_data else zero
+            self._scales[i] = self._interp_vec3(scl, seq_idx, time_ms, one) if scl.has_data else one
+            if rot.has_data:
+                self._q0[i], self._q1[i], self._qt[i] = self._quat_segment(rot, seq_idx, time_ms)
+            else:
+                self._q0[i], self._q1[i], self._qt[i] = identity, identity, 0.0
+        slerp_batch(self._q0, self._q1, self._qt, out=self._rots)
+
+    def _local_matrix(self, i: int) -> np.ndarray:
+        """Local transform of bone i from the sampled channels.
+
+        Written into a scratch matrix that the next call overwrites.
+        """
+        # local = T(pivot) * T(trans) * R(rot) * S(scl) * T(-pivot), in closed form:
+        # upper 3x3 = R*S, translation = pivot + trans - (R*S) @ pivot
+        p = self.parser.bone_pivots[i]
+        x, y, z, w = self._rots[i]
+        m = self._local
+        m[0, :3] = (1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w))
+        m[1, :3] = (2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w))
+        m[2, :3] = (2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y))
+        m[:3, :3] *= self._scales[i]
+        m[:3, 3] = p + self._trans[i] - m[:3, :3] @ p
         return m
 
     def _get_time_and_seq(self, track: M2Track, seq_idx: int, time_ms: float) -> tuple[int, float]:
@@ -617,6 +887,21 @@ class AnimationSystem:
             actual_time = time_ms
         return actual_seq, actual_time
 
+    def _find_key(self, ts: np.ndarray, t: float) -> int:
+        """Index of the last timestamp <= t, reusing the previous frame's segment when possible."""
+        n = len(ts)
+        key = id(ts)
+        last = self._last_key.get(key)
+        if last is not None and last + 1 < n:
+            if ts[last] <= t < ts[last + 1]:
+                return last
+            if ts[last + 1] <= t and (last + 2 >= n or t < ts[last + 2]):
+                self._last_key[key] = last + 1
+                return last + 1
+        idx = int(np.searchsorted(ts, t, side='right')) - 1
+        self._last_key[key] = idx
+        return idx
+
     def _interp_vec3(self, track: M2Track, seq_idx: int, time_ms: float,
                      default: np.ndarray) -> np.ndarray:
         si, t = self._get_time_and_seq(track, seq_idx, time_ms)
@@ -634,8 +919,7 @@ class AnimationSystem:
         if t >= ts[-1]:
             return keys[-1]
 
-        # Binary search
-        idx = np.searchsorted(ts, t, side='right') - 1
+        idx = self._find_key(ts, t)
         idx = max(0, min(idx, len(ts) - 2))
         t0, t1 = float(ts[idx]), float(ts[idx + 1])
         frac = (t - t0) / (t1 - t0) if t1 != t0 else 0.0
@@ -644,80 +928,87 @@ class AnimationSystem:
             return keys[idx]
         return keys[idx] * (1.0 - frac) + keys[idx + 1] * frac
 
-    def _interp_quat(self, track: M2Track, seq_idx: int, time_ms: float) -> np.ndarray:
+    def _quat_segment(self, track: M2Track, seq_idx: int,
+                      time_ms: float) -> tuple[np.ndarray, np.ndarray, float]:
+        """Rotation keyframe pair and blend factor at given time, for slerp_batch."""
         default = np.array([0, 0, 0, 1], dtype=np.float32)
         si, t = self._get_time_and_seq(track, seq_idx, time_ms)
         if si >= len(track.timestamps) or si >= len(track.keys):
-            return default
+            return default, default, 0.0
         ts = track.timestamps[si]
         keys = track.keys[si]
         if len(ts) == 0 or len(keys) == 0:
-            return default
+            return default, default, 0.0
         if len(keys.shape) == 1:
-            return default
+            return default, default, 0.0
 
         if t <= ts[0]:
-            return keys[0]
+            return keys[0], keys[0], 0.0
         if t >= ts[-1]:
-            return keys[-1]
+            return keys[-1], keys[-1], 0.0
 
-        idx = np.searchsorted(ts, t, side='right') - 1
+        idx = self._find_key(ts, t)
         idx = max(0, min(idx, len(ts) - 2))
         t0, t1 = float(ts[idx]), float(ts[idx + 1])
         frac = (t - t0) / (t1 - t0) if t1 != t0 else 0.0
 
         if track.interp == 0:
-            return keys[idx]
-        return slerp(keys[idx], keys[idx + 1], frac)
+            return keys[idx], keys[idx], 0.0
+        return keys[idx], keys[idx + 1], frac
+
+    def _skin_buffers(self, n: int) -> None:
+        """(Re)allocate the per-vertex skinning scratch buffers for n vertices."""
+        if self._pos4 is not None and len(self._pos4) == n:
+            return
+        self._pos4 = np.ones((n, 4), dtype=np.float32)
+        self._skin_weights = np.empty((n, 4), dtype=np.float32)
+        self._skin_mats = np.empty((n, 4, 4, 4), dtype=np.float32)
+        self._skin_transformed = np.empty((n, 4, 4), dtype=np.float32)
+        self._skin_result = np.empty((n, 4), dtype=np.float32)
+        self._skin_out = np.empty((n, 3), dtype=np.float32)
 
     def skin_vertices(self, positions: np.ndarray, bone_weights: np.ndarray,
                       bone_indices: np.ndarray, bone_lookup: list[int]) -> np.ndarray:
-        """CPU vertex skinning (NumPy vectorized). Returns transformed positions."""
+        """CPU vertex skinning (Numba kernel or NumPy vectorized). Returns transformed positions.
+
+        The returned array is reused by the next call; copy it if it must outlive the frame.
+        """
         if len(self.bone_matrices) == 0 or len(bone_lookup) == 0:
             return positions.copy()
 
         n = len(positions)
-        n_bones = len(self.bone_matrices)
-        n_lookup = len(bone_lookup)
-        lookup_arr = np.array(bone_lookup, dtype=np.int32)
+        # Resolve all 4 influences at once; invalid lookups get zero weight
+        global_bones, valid = resolve_bone_influences(
+            bone_indices, bone_lookup, len(self.bone_matrices))          # (n, 4)
 
-        # Build homogeneous positions (n, 4)
-        pos4 = np.ones((n, 4), dtype=np.float32)
-        pos4[:, :3] = positions
+        if HAS_NUMBA:
+            if len(self._skin_out) != n:
+                self._skin_out = np.empty((n, 3), dtype=np.float32)
+            _skin_positions(positions, bone_weights, global_bones, valid, self._bone_flat, self._skin_out)
+            return self._skin_out
 
-        # Weights normalized to float (n, 4)
-        weights = bone_weights.astype(np.float32) / 255.0
+        self._skin_buffers(n)
 
-        result = np.zeros((n, 4), dtype=np.float32)
+        # Homogeneous positions (n, 4); column 3 stays 1 from allocation
+        pos4 = self._pos4
+        pos4[:, :3] = positions
 
-        for j in range(4):
-            w = weights[:, j]  # (n,)
-            mask = w > 0.001
-            if not np.any(mask):
-                continue
+        # Weights normalized to float (n, 4)
+        weights = self._skin_weights
+        np.divide(bone_weights, 255.0, out=weights)
+        weights *= valid
 
-            bi = bone_indices[mask, j].astype(np.int32)
-            # Clamp bone lookup indices
-            valid = bi < n_lookup
-            bi = np.where(valid, bi, 0)
-            global_bones = lookup_arr[bi]
-            global_bones = np.where(valid, global_bones, 0)
-            valid2 = valid & (global_bones < n_bones)
-            global_bones = np.where(valid2, global_bones, 0)
-
-            # Gather bone matrices for these vertices: (count, 4, 4)
-            mats = self.bone_matrices[global_bones]
-            # Transform: (count, 4, 4) @ (count, 4, 1) -> (count, 4, 1)
-            transformed = np.einsum('nij,nj->ni', mats, pos4[mask])
-            # Apply weight and validity
-            weighted = transformed * w[mask, np.newaxis]
-            weighted[~valid2] = 0
-            result[mask] += weighted
+        # Gather whole 64-byte bone rows, transform by every influence bone, then blend:
+        # (n,4,4,4) x (n,4) -> (n,4,4) -> (n,4)
+        np.take(self._bone_flat, global_bones, axis=0, out=self._skin_mats.reshape(n, 4, 16))
+        mats = self._skin_mats
+        transformed = np.einsum('nvij,nj->nvi', mats, pos4, out=self._skin_transformed)
+        result = np.einsum('nvi,nv->ni', transformed, weights, out=self._skin_result)
 
         # De-homogenize
         w_col = result[:, 3:4]
         w_col = np.where(np.abs(w_col) > 0.001, w_col, 1.0)
-        return (result[:, :3] / w_col).astype(np.float32)
+        return np.divide(result[:, :3], w_col, out=self._skin_out)
 
 
 # ---------------------------------------------------------------------------
@@ -733,18 +1024,28 @@ class OrbitCamera:
         self.pan_x: float = 0.0
         self.pan_y: float = 0.0
 
+        # Per-frame scratch, rewritten in place by _eye_pos/get_view_matrix
+        self._up = np.array([0, 0, 1], dtype=np.float32)
+        self._tgt = np.empty(3, dtype=np.float32)
+        self._eye = np.empty(3, dtype=np.float32)
+        self._view = np.eye(4, dtype=np.float32)
+
     def get_view_matrix(self) -> np.ndarray:
+        """View matrix; the returned array is reused by the next call."""
         eye = self._eye_pos()
-        up = np.array([0, 0, 1], dtype=np.float32)
-        target = self.target + np.array([self.pan_x, self.pan_y, 0], dtype=np.float32)
-        return look_at(eye, target, up)
+        return look_at(eye, self._tgt, self._up, out=self._view)
 
     def _eye_pos(self) -> np.ndarray:
-        x = self.distance * math.cos(self.elevation) * math.cos(self.azimuth)
-        y = self.distance * math.cos(self.elevation) * math.sin(self.azimuth)
-        z = self.distance * math.sin(self.elevation)
-        target = self.target + np.array([self.pan_x, self.pan_y, 0], dtype=np.float32)
-        return target + np.array([x, y, z], dtype=np.float32)
+        tgt = self._tgt
+        tgt[:] = self.target
+        tgt[0] += self.pan_x
+        tgt[1] += self.pan_y
+        ce = math.cos(self.elevation)
+        eye = self._eye
+        eye[0] = tgt[0] + self.distance * ce * math.cos(self.azimuth)
+        eye[1] = tgt[1] + self.distance * ce * math.sin(self.azimuth)
+        eye[2] = tgt[2] + self.distance * math.sin(self.elevation)
+        return eye
 
     def orbit(self, dx: float, dy: float):
         self.azimuth += dx * 0.01
@@ -784,36 +1085,85 @@ void main() {
 }
 """
 
-FRAG_SHADER = """
-#version 330 core
+# M2 fragment shader, specialized at compile time instead of branching on a uniform
+# per fragment: HAS_TEX selects the textured variant.
+_MODEL_FRAG_GLSL = """
 in vec3 vNormal;
 in vec2 vUV;
 in vec3 vWorldPos;
 
 uniform sampler2D uTexture;
-uniform int uHasTexture;
 uniform vec3 uLightDir;
 
 out vec4 FragColor;
 
 void main() {
     vec3 N = normalize(vNormal);
-    float NdotL = abs(dot(N, uLightDir));
-    float ambient = 0.35;
-    float diffuse = 0.65 * NdotL;
-    float light = ambient + diffuse;
-
-    vec4 texColor;
-    if (uHasTexture == 1) {
-        texColor = texture(uTexture, vUV);
-        if (texColor.a < 0.1) discard;
-    } else {
-        texColor = vec4(0.6, 0.6, 0.65, 1.0);
-    }
+    float light = 0.35 + 0.65 * abs(dot(N, uLightDir));
+
+#ifdef HAS_TEX
+    vec4 texColor = texture(uTexture, vUV);
+    if (texColor.a < 0.1) discard;
+#else
+    const vec4 texColor = vec4(0.6, 0.6, 0.65, 1.0);
+#endif
 
     FragColor = vec4(texColor.rgb * light, texColor.a);
 }
 """
+FRAG_SHADER_TEX = "#version 330 core\n#define HAS_TEX\n" + _MODEL_FRAG_GLSL
+FRAG_SHADER_FLAT = "#version 330 core\n" + _MODEL_FRAG_GLSL
+
+# GPU skinning: bone matrices live in a std140 uniform block, bone indices/weights are
+# static per-vertex attributes uploaded once at load.
+MAX_GPU_BONES = 256
+
+_SKIN_GLSL = f"""
+#version 330 core
+layout(location=0) in vec3 aPos;
+layout(location=3) in uvec4 aBoneIdx;
+layout(location=4) in vec4 aBoneWeight;
+
+layout(std140, row_major) uniform Bones {{
+    mat4 uBones[{MAX_GPU_BONES}];
+}};
+
+vec3 skinPosition() {{
+    vec4 p = vec4(aPos, 1.0);
+    vec4 s = aBoneWeight.x * (uBones[aBoneIdx.x] * p)
+           + aBoneWeight.y * (uBones[aBoneIdx.y] * p)
+           + aBoneWeight.z * (uBones[aBoneIdx.z] * p)
+           + aBoneWeight.w * (uBones[aBoneIdx.w] * p);
+    return abs(s.w) > 0.001 ? s.xyz / s.w : s.xyz;
+}}
+"""
+
+SKIN_VERT_SHADER = _SKIN_GLSL + """
+layout(location=1) in vec3 aNormal;
+layout(location=2) in vec2 aUV;
+
+uniform mat4 uMVP;
+uniform mat4 uModel;
+
+out vec3 vNormal;
+out vec2 vUV;
+out vec3 vWorldPos;
+
+void main() {
+    vec3 pos = skinPosition();
+    gl_Position = uMVP * vec4(pos, 1.0);
+    vNormal = mat3(uModel) * aNormal;
+    vUV = aUV;
+    vWorldPos = (uModel * vec4(pos, 1.0)).xyz;
+}
+"""
+
+SKIN_WIRE_VERT = _SKIN_GLSL + """
+uniform mat4 uMVP;
+void main() {
+    gl_Position = uMVP * vec4(skinPosition(), 1.0);
+}
+"""
 
 WIRE_VERT = """
 #version 330 core
@@ -833,6 +1183,262 @@ void main() {
 """
 
 
+def _compile_program(gl, vert_src: str, frag_src: str) -> int:
+    """Compile and link a vertex + fragment program, printing any info logs."""
+    vs = gl.glCreateShader(gl.GL_VERTEX_SHADER)
+    gl.glShaderSource(vs, vert_src)
+    gl.glCompileShader(vs)
+    if gl.glGetShaderiv(vs, gl.GL_COMPILE_STATUS) != gl.GL_TRUE:
+        log = gl.glGetShaderInfoLog(vs).decode()
+        print(f"Vertex shader error: {log}")
+
+    fs = gl.glCreateShader(gl.GL_FRAGMENT_SHADER)
+    gl.glShaderSource(fs, frag_src)
+    gl.glCompileShader(fs)
+    if gl.glGetShaderiv(fs, gl.GL_COMPILE_STATUS) != gl.GL_TRUE:
+        log = gl.glGetShaderInfoLog(fs).decode()
+        print(f"Fragment shader error: {log}")
+
+    prog = gl.glCreateProgram()
+    gl.glAttachShader(prog, vs)
+    gl.glAttachShader(prog, fs)
+    gl.glLinkProgram(prog)
+    if gl.glGetProgramiv(prog, gl.GL_LINK_STATUS) != gl.GL_TRUE:
+        log = gl.glGetProgramInfoLog(prog).decode()
+        print(f"Program link error: {log}")
+
+    gl.glDeleteShader(vs)
+    gl.glDeleteShader(fs)
+    return prog
+
+
+# Uniforms shared by the static and skinned model programs
+_MODEL_UNIFORMS = ("uMVP", "uModel", "uLightDir")
+
+# Fixed directional light used by both the M2 and WMO renderers
+_LIGHT_DIR = np.array([0.5, 0.3, 0.8], dtype=np.float32)
+_LIGHT_DIR /= np.linalg.norm(_LIGHT_DIR)
+
+
+# pygame.Surface channel masks that put pixels in memory as R, G, B, A bytes
+_RGBA_MASKS = ((0xFF, 0xFF00, 0xFF0000, 0xFF000000) if sys.byteorder == "little"
+               else (0xFF000000, 0xFF0000, 0xFF00, 0xFF))
+
+
+class _PixelUploader:
+    """Ring of pixel unpack buffers for texture uploads.
+
+    Pixels are copied into a mapped PBO and glTex(Sub)Image2D reads from the bound
+    buffer, so the driver can DMA asynchronously instead of stalling on a client copy.
+    Consecutive uploads alternate between buffers.
+    """
+
+    def __init__(self, gl, count: int = 2):
+        self._gl = gl
+        self._pbos = [int(b) for b in np.atleast_1d(gl.glGenBuffers(count))]
+        self._sizes = [0] * count
+        self._next = 0
+
+    def stage(self, data: bytes | np.ndarray) -> None:
+        """Copy `data` into the next PBO and leave it bound to GL_PIXEL_UNPACK_BUFFER."""
+        gl = self._gl
+        src = np.frombuffer(data, dtype=np.uint8) if isinstance(data, bytes) else np.ascontiguousarray(data)
+        nbytes = src.nbytes
+        slot = self._next
+        self._next = (slot + 1) % len(self._pbos)
+
+        gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, self._pbos[slot])
+        if nbytes > self._sizes[slot]:
+            gl.glBufferData(gl.GL_PIXEL_UNPACK_BUFFER, nbytes, None, gl.GL_STREAM_DRAW)
+            self._sizes[slot] = nbytes
+        ptr = gl.glMapBufferRange(gl.GL_PIXEL_UNPACK_BUFFER, 0, nbytes,
+                                  gl.GL_MAP_WRITE_BIT | gl.GL_MAP_INVALIDATE_BUFFER_BIT)
+        if ptr:
+            ctypes.memmove(ptr, src.ctypes.data, nbytes)
+            gl.glUnmapBuffer(gl.GL_PIXEL_UNPACK_BUFFER)
+        else:
+            gl.glBufferSubData(gl.GL_PIXEL_UNPACK_BUFFER, 0, nbytes, src)
+
+    def unbind(self) -> None:
+        """Restore client-memory pixel unpacking."""
+        self._gl.glBindBuffer(self._gl.GL_PIXEL_UNPACK_BUFFER, 0)
+
+
+BLIT_VERT_SHADER = """
+#version 330 core
+layout(location=0) in vec2 aCorner;
+uniform vec4 uRect;  // (x0, y0, x1, y1) in NDC
+out vec2 vUV;
+void main() {
+    gl_Position = vec4(mix(uRect.xy, uRect.zw, aCorner), 0.0, 1.0);
+    vUV = vec2(aCorner.x, 1.0 - aCorner.y);  // textures are uploaded top row first
+}
+"""
+
+BLIT_FRAG_SHADER = """
+#version 330 core
+in vec2 vUV;
+uniform sampler2D uTex;
+out vec4 FragColor;
+void main() {
+    FragColor = texture(uTex, vUV);
+}
+"""
+
+
+class _QuadBlitter:
+    """Screen-space texture blit for the viewers' HUDs.
+
+    A unit quad is uploaded once and stretched over the target rect by the uRect
+    uniform, so moving or resizing the rect never touches a vertex buffer.
+    """
+
+    def __init__(self, gl):
+        self._gl = gl
+        self._shader = _compile_program(gl, BLIT_VERT_SHADER, BLIT_FRAG_SHADER)
+        self._rect_loc = gl.glGetUniformLocation(self._shader, "uRect")
+        # The sampler always reads texture unit 0; set it once
+        gl.glUseProgram(self._shader)
+        gl.glUniform1i(gl.glGetUniformLocation(self._shader, "uTex"), 0)
+
+        corners = np.array([0, 0, 1, 0, 1, 1, 0, 0, 1, 1, 0, 1], dtype=np.float32)
+        self._vao = gl.glGenVertexArrays(1)
+        self._vbo = gl.glGenBuffers(1)
+        gl.glBindVertexArray(self._vao)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._vbo)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, corners.nbytes, corners, gl.GL_STATIC_DRAW)
+        gl.glVertexAttribPointer(0, 2, gl.GL_FLOAT, gl.GL_FALSE, 8, gl.ctypes.c_void_p(0))
+        gl.glEnableVertexAttribArray(0)
+        gl.glBindVertexArray(0)
+
+    def draw(self, tex_id: int, x: float, y: float, w: float, h: float,
+             view_w: int, view_h: int) -> None:
+        """Alpha-blend `tex_id` over the pixel rect (x, y, w, h) of a view_w x view_h viewport."""
+        gl = self._gl
+        gl.glDisable(gl.GL_DEPTH_TEST)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+
+        gl.glUseProgram(self._shader)
+        # Convert pixel coords to NDC
+        gl.glUniform4f(self._rect_loc,
+                       2.0 * x / view_w - 1.0, 2.0 * y / view_h - 1.0,
+                       2.0 * (x + w) / view_w - 1.0, 2.0 * (y + h) / view_h - 1.0)
+        gl.glActiveTexture(gl.GL_TEXTURE0)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, tex_id)
+
+        gl.glBindVertexArray(self._vao)
+        gl.glDrawArrays(gl.GL_TRIANGLES, 0, 6)
+
+        gl.glBindVertexArray(0)
+        gl.glEnable(gl.GL_DEPTH_TEST)
+        gl.glDisable(gl.GL_BLEND)
+
+
+# Bytes of each BLP hashed for its cache key: header + first mip are effectively unique
+_CACHE_PROBE_BYTES = 64 * 1024
+
+
+def _load_cache_index(cache_dir: Path) -> dict[str, list]:
+    """Read the cache index: BLP path -> [size, mtime_ns, cache key]."""
+    try:
+        with open(cache_dir / "index.json", encoding="utf-8") as f:
+            index = json.load(f)
+        return index if isinstance(index, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache_index(cache_dir: Path, index: dict[str, list]) -> None:
+    tmp = cache_dir / "index.json.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp, cache_dir / "index.json")
+    except OSError as e:
+        print(f"Could not write texture cache index: {e}")
+
+
+def _texture_cache_key(blp_path: str, index: dict[str, list]) -> str:
+    """Content-based cache key for a BLP; unchanged files are answered from the index.
+
+    Raises OSError if the BLP cannot be read. Updates `index` in place on a miss.
+    """
+    st = os.stat(blp_path)
+    entry = index.get(blp_path)
+    if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+        return entry[2]
+    h = hashlib.blake2b(digest_size=16)
+    h.update(st.st_size.to_bytes(8, "little"))
+    with open(blp_path, "rb") as f:
+        h.update(f.read(_CACHE_PROBE_BYTES))
+    key = h.hexdigest()
+    index[blp_path] = [st.st_size, st.st_mtime_ns, key]
+    return key
+
+
+def _convert_blp(blp_convert: str, blp_path: str, cached_png: Path, fname: str) -> bool:
+    """Convert one BLP into `cached_png` with the external blp_convert tool."""
+    try:
+        # Copy BLP to temp dir for conversion (avoids read-only source dirs)
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_blp = Path(tmpdir) / Path(blp_path).name
+            shutil.copy2(blp_path, str(tmp_blp))
+            result = subprocess.run(
+                [blp_convert, "--to-png", str(tmp_blp)],
+                capture_output=True, text=True, timeout=10,
+            )
+            output_png = tmp_blp.with_suffix(".png")
+            if result.returncode != 0 or not output_png.exists():
+                print(f"blp_convert failed for {fname}: {result.stderr}")
+                return False
+            shutil.move(str(output_png), str(cached_png))
+            return True
+    except Exception as e:
+        print(f"BLP convert failed for {fname}: {e}")
+        return False
+
+
+def _decoded_path(png_path: Path) -> Path:
+    """Raw RGBA .npy kept next to a cached PNG so later runs skip PNG decode."""
+    return png_path.with_suffix(".npy")
+
+
+def _decode_texture(png_path: Path, fname: str) -> np.ndarray | None:
+    """Bottom-up RGBA array ready for glTexImage2D.
+
+    Served memory-mapped from the .npy cache when present; otherwise decoded from the
+    cached PNG with PIL and saved to that cache.
+    """
+    npy_path = _decoded_path(png_path)
+    try:
+        return np.load(npy_path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+
+    from PIL import Image
+    try:
+        img = Image.open(png_path)
+        img = img.transpose(Image.FLIP_TOP_BOTTOM)
+        if img.mode != "RGBA":
+            img = img.convert("RGBA")
+        img_data = np.array(img, dtype=np.uint8)
+    except Exception as e:
+        print(f"Texture load failed for {fname}: {e}")
+        return None
+
+    # Write-then-rename so a concurrent reader never sees a partial file
+    tmp = npy_path.with_name(f"{npy_path.name}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            np.save(f, img_data)
+        os.replace(tmp, npy_path)
+    except OSError:
+        pass
+    return img_data
+
+
 class M2Renderer:
     """OpenGL 3.3 renderer for M2 models."""
 
@@ -842,20 +1448,29 @@ class M2Renderer:
         self.blp_convert_path = blp_convert
 
         self.vao = 0
-        self.vbo = 0
+        self.vbo = 0         # positions, streamed each frame when CPU skinning
+        self.static_vbo = 0  # normals + UVs, uploaded once
         self.ebo = 0
-        self.wire_vao = 0
-        self.wire_vbo = 0
-        self.wire_ebo = 0
-        self.shader = 0
+        self.shader_tex = 0
+        self.shader_flat = 0
         self.wire_shader = 0
+        self.skin_shader_tex = 0
+        self.skin_shader_flat = 0
+        self.skin_wire_shader = 0
+        self.skin_vbo = 0
+        self.bone_ubo = 0
+        self.gpu_skinning = False
+        self.uniforms: dict[int, dict[str, int]] = {}  # program -> uniform name -> location
         self.gl_textures: dict[int, int] = {}  # batch index -> GL texture ID
-        self.batch_texture_map: dict[int, int] = {}  # batch idx -> texture array index
+        self._batch_gl_tex = np.zeros(0, dtype=np.uint32)  # batch idx -> GL texture (0 = none)
+        # Draw list sorted by GL texture (0 = untextured): (gl_tex, index_start, index_count)
+        self.render_list: list[tuple[int, int, int]] = []
 
         self.show_wireframe = False
         self.n_indices = 0
-        self.n_wire_indices = 0
         self.n_verts = 0
+        self.idx_type = 0    # GL element type, set by init_gl
+        self.idx_size = 2    # bytes per index
 
     def init_gl(self):
         import OpenGL.GL as gl
@@ -863,8 +1478,11 @@ class M2Renderer:
         self._gl = gl
 
         # Build shaders
-        self.shader = self._compile_program(VERT_SHADER, FRAG_SHADER)
+        self.shader_tex = self._compile_program(VERT_SHADER, FRAG_SHADER_TEX)
+        self.shader_flat = self._compile_program(VERT_SHADER, FRAG_SHADER_FLAT)
         self.wire_shader = self._compile_program(WIRE_VERT, WIRE_FRAG)
+        self._cache_model_uniforms(self.shader_tex, self.shader_flat)
+        self._cache_uniforms(self.wire_shader, "uMVP")
 
         p = self.parser
         n_verts = len(p.positions)
@@ -872,61 +1490,52 @@ class M2Renderer:
             return
         self.n_verts = n_verts
 
-        # VBO: ALL model vertices, interleaved pos(12) + normal(12) + uv(8) = 32 bytes
-        vbo_data = np.zeros((n_verts, 8), dtype=np.float32)
-        vbo_data[:, 0:3] = p.positions
-        vbo_data[:, 3:6] = p.normals if len(p.normals) == n_verts else np.zeros((n_verts, 3), dtype=np.float32)
-        vbo_data[:, 6:8] = p.uvs if len(p.uvs) == n_verts else np.zeros((n_verts, 2), dtype=np.float32)
-
-        # EBO: resolved global vertex indices (after two-level skin indirection)
+        # Two vertex streams over ALL model vertices: positions (12 bytes) are the only
+        # per-frame data; normal(12) + uv(8) = 20 bytes interleaved never change.
+        # Both column groups are always written, so no zero-fill is needed.
+        static_data = np.empty((n_verts, 5), dtype=np.float32)
+        static_data[:, 0:3] = p.normals if len(p.normals) == n_verts else 0.0
+        static_data[:, 3:5] = p.uvs if len(p.uvs) == n_verts else 0.0
+
+        # EBO: resolved global vertex indices (after two-level skin indirection).
+        # 16-bit unless the vertex count needs more; no copy when already that dtype.
+        idx_dtype = np.uint16 if n_verts <= 65536 else np.uint32
+        self.idx_type = gl.GL_UNSIGNED_SHORT if idx_dtype is np.uint16 else gl.GL_UNSIGNED_INT
+        self.idx_size = np.dtype(idx_dtype).itemsize
         if len(p.resolved_indices) > 0:
-            idx_data = p.resolved_indices.astype(np.uint16)
+            idx_data = np.ascontiguousarray(p.resolved_indices, dtype=idx_dtype)
         elif len(p.triangles) > 0:
-            idx_data = p.triangles.astype(np.uint16)
+            idx_data = np.ascontiguousarray(p.triangles, dtype=idx_dtype)
         else:
-            idx_data = np.empty(0, dtype=np.uint16)
+            idx_data = np.empty(0, dtype=idx_dtype)
 
         # Create main VAO/VBO/EBO
         self.vao = gl.glGenVertexArrays(1)
         self.vbo = gl.glGenBuffers(1)
+        self.static_vbo = gl.glGenBuffers(1)
         self.ebo = gl.glGenBuffers(1)
 
         gl.glBindVertexArray(self.vao)
 
         gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
-        gl.glBufferData(gl.GL_ARRAY_BUFFER, vbo_data.nbytes, vbo_data, gl.GL_DYNAMIC_DRAW)
-
-        if len(idx_data) > 0:
-            self.n_indices = len(idx_data)
-            gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self.ebo)
-            gl.glBufferData(gl.GL_ELEMENT_ARRAY_BUFFER, idx_data.nbytes, idx_data, gl.GL_STATIC_DRAW)
-
-        stride = 32
-        gl.glVertexAttribPointer(0, 3, gl.GL_FLOAT, gl.GL_FALSE, stride, gl.ctypes.c_void_p(0))
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, p.positions.nbytes, p.positions, gl.GL_STREAM_DRAW)
+        gl.glVertexAttribPointer(0, 3, gl.GL_FLOAT, gl.GL_FALSE, 12, gl.ctypes.c_void_p(0))
         gl.glEnableVertexAttribArray(0)
-        gl.glVertexAttribPointer(1, 3, gl.GL_FLOAT, gl.GL_FALSE, stride, gl.ctypes.c_void_p(12))
+
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.static_vbo)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, static_data.nbytes, static_data, gl.GL_STATIC_DRAW)
+        gl.glVertexAttribPointer(1, 3, gl.GL_FLOAT, gl.GL_FALSE, 20, gl.ctypes.c_void_p(0))
         gl.glEnableVertexAttribArray(1)
-        gl.glVertexAttribPointer(2, 2, gl.GL_FLOAT, gl.GL_FALSE, stride, gl.ctypes.c_void_p(24))
+        gl.glVertexAttribPointer(2, 2, gl.GL_FLOAT, gl.GL_FALSE, 20, gl.ctypes.c_void_p(12))
         gl.glEnableVertexAttribArray(2)
 
-        gl.glBindVertexArray(0)
-
-        # Wireframe VAO (positions only, same indices)
-        self.wire_vao = gl.glGenVertexArrays(1)
-        self.wire_vbo = gl.glGenBuffers(1)
-        self.wire_ebo = gl.glGenBuffers(1)
-
-        gl.glBindVertexArray(self.wire_vao)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.wire_vbo)
-        gl.glBufferData(gl.GL_ARRAY_BUFFER, p.positions.nbytes, p.positions, gl.GL_DYNAMIC_DRAW)
-
         if len(idx_data) > 0:
-            self.n_wire_indices = len(idx_data)
-            gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self.wire_ebo)
+            self.n_indices = len(idx_data)
+            gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self.ebo)
             gl.glBufferData(gl.GL_ELEMENT_ARRAY_BUFFER, idx_data.nbytes, idx_data, gl.GL_STATIC_DRAW)
 
-        gl.glVertexAttribPointer(0, 3, gl.GL_FLOAT, gl.GL_FALSE, 12, gl.ctypes.c_void_p(0))
-        gl.glEnableVertexAttribArray(0)
+        self._init_gpu_skinning()
+
         gl.glBindVertexArray(0)
 
         # Load textures
@@ -935,39 +1544,79 @@ class M2Renderer:
         # Map batches to textures
         self._map_batch_textures()
 
-    def _compile_program(self, vert_src: str, frag_src: str) -> int:
+    def _init_gpu_skinning(self):
+        """Set up bone attributes and the bone UBO on the bound VAO; CPU skinning stays the fallback."""
         gl = self._gl
-        vs = gl.glCreateShader(gl.GL_VERTEX_SHADER)
-        gl.glShaderSource(vs, vert_src)
-        gl.glCompileShader(vs)
-        if gl.glGetShaderiv(vs, gl.GL_COMPILE_STATUS) != gl.GL_TRUE:
-            log = gl.glGetShaderInfoLog(vs).decode()
-            print(f"Vertex shader error: {log}")
+        p = self.parser
+        n_bones = len(p.bones)
+        if n_bones == 0 or n_bones > MAX_GPU_BONES or not p.bone_lookup:
+            return
 
-        fs = gl.glCreateShader(gl.GL_FRAGMENT_SHADER)
-        gl.glShaderSource(fs, frag_src)
-        gl.glCompileShader(fs)
-        if gl.glGetShaderiv(fs, gl.GL_COMPILE_STATUS) != gl.GL_TRUE:
-            log = gl.glGetShaderInfoLog(fs).decode()
-            print(f"Fragment shader error: {log}")
+        self.skin_shader_tex = self._compile_program(SKIN_VERT_SHADER, FRAG_SHADER_TEX)
+        self.skin_shader_flat = self._compile_program(SKIN_VERT_SHADER, FRAG_SHADER_FLAT)
+        self.skin_wire_shader = self._compile_program(SKIN_WIRE_VERT, WIRE_FRAG)
+        for prog in (self.skin_shader_tex, self.skin_shader_flat, self.skin_wire_shader):
+            if gl.glGetProgramiv(prog, gl.GL_LINK_STATUS) != gl.GL_TRUE:
+                return
+            gl.glUniformBlockBinding(prog, gl.glGetUniformBlockIndex(prog, "Bones"), 0)
+        self._cache_model_uniforms(self.skin_shader_tex, self.skin_shader_flat)
+        self._cache_uniforms(self.skin_wire_shader, "uMVP")
+
+        # Static per-vertex skin data: global bone idx u16[4] + weight f32[4] = 24 bytes
+        global_bones, valid = resolve_bone_influences(p.bone_indices, p.bone_lookup, n_bones)
+        skin_data = np.empty(len(global_bones), dtype=[("idx", "<u2", (4,)), ("w", "<f4", (4,))])
+        skin_data["idx"] = global_bones
+        skin_data["w"] = p.bone_weights / np.float32(255.0) * valid
+
+        self.skin_vbo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.skin_vbo)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, skin_data.nbytes, skin_data, gl.GL_STATIC_DRAW)
+        gl.glVertexAttribIPointer(3, 4, gl.GL_UNSIGNED_SHORT, 24, gl.ctypes.c_void_p(0))
+        gl.glEnableVertexAttribArray(3)
+        gl.glVertexAttribPointer(4, 4, gl.GL_FLOAT, gl.GL_FALSE, 24, gl.ctypes.c_void_p(8))
+        gl.glEnableVertexAttribArray(4)
+
+        # Bone UBO, identity until the first animation update
+        bones = np.tile(np.eye(4, dtype=np.float32), (MAX_GPU_BONES, 1, 1))
+        self.bone_ubo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self.bone_ubo)
+        gl.glBufferData(gl.GL_UNIFORM_BUFFER, bones.nbytes, bones, gl.GL_DYNAMIC_DRAW)
+        gl.glBindBufferBase(gl.GL_UNIFORM_BUFFER, 0, self.bone_ubo)
+        self.gpu_skinning = True
+
+    def _cache_uniforms(self, prog: int, *names: str):
+        """Look up uniform locations once per program; render() reads them from self.uniforms."""
+        gl = self._gl
+        self.uniforms[prog] = {name: gl.glGetUniformLocation(prog, name) for name in names}
 
-        prog = gl.glCreateProgram()
-        gl.glAttachShader(prog, vs)
-        gl.glAttachShader(prog, fs)
-        gl.glLinkProgram(prog)
-        if gl.glGetProgramiv(prog, gl.GL_LINK_STATUS) != gl.GL_TRUE:
-            log = gl.glGetProgramInfoLog(prog).decode()
-            print(f"Program link error: {log}")
+    def _cache_model_uniforms(self, tex_prog: int, flat_prog: int):
+        """Cache the textured/flat model program uniforms and bind the sampler to unit 0."""
+        gl = self._gl
+        self._cache_uniforms(tex_prog, *_MODEL_UNIFORMS)
+        self._cache_uniforms(flat_prog, *_MODEL_UNIFORMS)
+        gl.glUseProgram(tex_prog)
+        gl.glUniform1i(gl.glGetUniformLocation(tex_prog, "uTexture"), 0)
+        gl.glUseProgram(0)
+
+    def update_bones(self, bone_matrices: np.ndarray):
+        """Upload this frame's bone matrices (row-major) to the bone UBO."""
+        gl = self._gl
+        if not self.gpu_skinning or len(bone_matrices) == 0:
+            return
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self.bone_ubo)
+        gl.glBufferSubData(gl.GL_UNIFORM_BUFFER, 0, bone_matrices.nbytes, bone_matrices)
 
-        gl.glDeleteShader(vs)
-        gl.glDeleteShader(fs)
-        return prog
+    def _compile_program(self, vert_src: str, frag_src: str) -> int:
+        return _compile_program(self._gl, vert_src, frag_src)
 
     def _load_textures(self):
-        """Load BLP textures via blp_convert → PIL → GL texture."""
+        """Load BLP textures via blp_convert → PIL → GL texture.
+
+        Conversion and PNG decode run on a thread pool; GL upload stays on this thread.
+        """
         gl = self._gl
         try:
-            from PIL import Image
+            from PIL import Image  # noqa: F401
         except ImportError:
             print("PIL not available, textures disabled")
             return
@@ -975,6 +1624,11 @@ class M2Renderer:
         cache_dir = Path(os.path.expanduser("~/.cache/m2_viewer"))
         cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # First pass: resolve every texture and collect the ones not yet cached as PNG
+        index = _load_cache_index(cache_dir)
+        stored_index = dict(index)
+        jobs: list[tuple[int, str, Path]] = []
+        to_convert: dict[Path, tuple[str, str]] = {}
         for i, tex in enumerate(self.parser.textures):
             if tex["type"] != 0 or not tex["filename"]:
                 continue
@@ -984,41 +1638,40 @@ class M2Renderer:
             if not blp_path:
                 continue
 
-            # Convert BLP to PNG
-            cache_key = hashlib.md5(blp_path.encode()).hexdigest()
+            try:
+                cache_key = _texture_cache_key(blp_path, index)
+            except OSError as e:
+                print(f"BLP convert failed for {fname}: {e}")
+                continue
             cached_png = cache_dir / f"{cache_key}.png"
+            jobs.append((i, fname, cached_png))
+            if not cached_png.exists() and not _decoded_path(cached_png).exists():
+                to_convert.setdefault(cached_png, (fname, blp_path))
+        if index != stored_index:
+            _save_cache_index(cache_dir, index)
+        if not jobs:
+            return
 
-            if not cached_png.exists():
-                try:
-                    # Copy BLP to temp dir for conversion (avoids read-only source dirs)
-                    import tempfile
-                    with tempfile.TemporaryDirectory() as tmpdir:
-                        tmp_blp = Path(tmpdir) / Path(blp_path).name
-                        shutil.copy2(blp_path, str(tmp_blp))
-                        result = subprocess.run(
-                            [self.blp_convert_path, "--to-png", str(tmp_blp)],
-                            capture_output=True, text=True, timeout=10,
-                        )
-                        output_png = tmp_blp.with_suffix(".png")
-                        if result.returncode != 0 or not output_png.exists():
-                            print(f"blp_convert failed for {fname}: {result.stderr}")
-                            continue
-                        shutil.move(str(output_png), str(cached_png))
-                except Exception as e:
-                    print(f"BLP convert failed for {fname}: {e}")
-                    continue
-
+        with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 4)) as pool:
+            converting = {
+                png: pool.submit(_convert_blp, self.blp_convert_path, blp_path, png, fname)
+                for png, (fname, blp_path) in to_convert.items()
+            }
+            failed = {png for png, fut in converting.items() if not fut.result()}
+            jobs = [job for job in jobs if job[2] not in failed]
+            decoded = list(pool.map(_decode_texture, [job[2] for job in jobs], [job[1] for job in jobs]))
+
+        uploader = _PixelUploader(gl)
+        for (i, fname, _), img_data in zip(jobs, decoded):
+            if img_data is None:
+                continue
             try:
-                img = Image.open(cached_png)
-                img = img.transpose(Image.FLIP_TOP_BOTTOM)
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-                img_data = np.array(img, dtype=np.uint8)
-
                 tex_id = gl.glGenTextures(1)
                 gl.glBindTexture(gl.GL_TEXTURE_2D, tex_id)
-                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, img.width, img.height,
-                                0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, img_data)
+                uploader.stage(img_data)
+                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, img_data.shape[1], img_data.shape[0],
+                                0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, None)
+                uploader.unbind()
                 gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
                 gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR_MIPMAP_LINEAR)
                 gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
@@ -1031,36 +1684,69 @@ class M2Renderer:
 
     def _map_batch_textures(self):
         """Resolve batch → texture combo → texture lookup → GL texture mapping."""
+        p = self.parser
+        tci = np.fromiter((b.texture_combo_index for b in p.batches), dtype=np.int64,
+                          count=len(p.batches))
+        lookup = np.asarray(p.texture_lookup, dtype=np.int64)
+
+        # Texture index -> GL texture LUT, 0 where nothing was loaded
+        tex_to_gl = np.zeros(max(len(p.textures), int(lookup.max(initial=-1)) + 1), dtype=np.uint32)
+        for tex_idx, tex_id in self.gl_textures.items():
+            tex_to_gl[tex_idx] = tex_id
+
+        in_range = tci < len(lookup)
+        tex_idx = lookup[np.where(in_range, tci, 0)] if len(lookup) else np.zeros_like(tci)
+        self._batch_gl_tex = np.where(in_range, tex_to_gl[tex_idx], 0).astype(np.uint32)
+        self._build_render_list()
+
+    def _build_render_list(self):
+        """Group batch draws by texture so render() binds each texture once.
+
+        Same-texture draws whose index ranges are adjacent are merged into one draw.
+        """
+        draws = []
+        submeshes = self.parser.submeshes
+        batch_gl_tex = self._batch_gl_tex.tolist()
         for bi, batch in enumerate(self.parser.batches):
-            tci = batch.texture_combo_index
-            if tci < len(self.parser.texture_lookup):
-                tex_idx = self.parser.texture_lookup[tci]
-                if tex_idx in self.gl_textures:
-                    self.batch_texture_map[bi] = self.gl_textures[tex_idx]
+            if batch.submesh_index >= len(submeshes):
+                continue
+            sm = submeshes[batch.submesh_index]
+            if sm.index_start + sm.index_count <= self.n_indices:
+                draws.append((batch_gl_tex[bi], sm.index_start, sm.index_count))
+        draws.sort(key=lambda d: d[0])  # stable: keeps batch order within a texture
+
+        self.render_list = []
+        for tex, start, count in draws:
+            if self.render_list:
+                prev_tex, prev_start, prev_count = self.render_list[-1]
+                if prev_tex == tex and prev_start + prev_count == start:
+                    self.render_list[-1] = (tex, prev_start, prev_count + count)
+                    continue
+            self.render_list.append((tex, start, count))
 
     def update_vertices(self, skinned_positions: np.ndarray):
-        """Upload new skinned vertex positions to VBO."""
+        """Upload new skinned vertex positions; normals and UVs stay in the static VBO."""
         gl = self._gl
         if self.vao == 0 or len(skinned_positions) == 0:
             return
 
-        p = self.parser
-        n_verts = len(skinned_positions)
-
-        # Rebuild interleaved VBO data with new positions
-        vbo_data = np.zeros((n_verts, 8), dtype=np.float32)
-        vbo_data[:, 0:3] = skinned_positions
-        vbo_data[:, 3:6] = p.normals if len(p.normals) == n_verts else np.zeros((n_verts, 3), dtype=np.float32)
-        vbo_data[:, 6:8] = p.uvs if len(p.uvs) == n_verts else np.zeros((n_verts, 2), dtype=np.float32)
-
+        # Orphan the position store so the driver need not wait on last frame's draw
+        nbytes = skinned_positions.nbytes
         gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
-        gl.glBufferSubData(gl.GL_ARRAY_BUFFER, 0, vbo_data.nbytes, vbo_data)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, nbytes, None, gl.GL_STREAM_DRAW)
+        gl.glBufferSubData(gl.GL_ARRAY_BUFFER, 0, nbytes, skinned_positions)
 
-        # Update wireframe VBO too
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.wire_vbo)
-        gl.glBufferSubData(gl.GL_ARRAY_BUFFER, 0, skinned_positions.nbytes, skinned_positions)
+    def _use_model_program(self, prog: int, mvp: np.ndarray, model: np.ndarray):
+        """Bind a model program and upload this frame's matrices and light direction."""
+        gl = self._gl
+        u = self.uniforms[prog]
+        gl.glUseProgram(prog)
+        gl.glUniformMatrix4fv(u["uMVP"], 1, gl.GL_FALSE, mvp)
+        gl.glUniformMatrix4fv(u["uModel"], 1, gl.GL_FALSE, model)
+        gl.glUniform3fv(u["uLightDir"], 1, _LIGHT_DIR)
 
     def render(self, mvp: np.ndarray, model: np.ndarray):
+        """Draw the model; mvp and model are column-major (transposed), as GL reads them."""
         gl = self._gl
         if self.vao == 0 or self.n_indices == 0:
             return
@@ -1068,69 +1754,52 @@ class M2Renderer:
         gl.glEnable(gl.GL_DEPTH_TEST)
         gl.glDisable(gl.GL_CULL_FACE)
 
-        gl.glUseProgram(self.shader)
-
-        mvp_loc = gl.glGetUniformLocation(self.shader, "uMVP")
-        model_loc = gl.glGetUniformLocation(self.shader, "uModel")
-        tex_loc = gl.glGetUniformLocation(self.shader, "uTexture")
-        has_tex_loc = gl.glGetUniformLocation(self.shader, "uHasTexture")
-        light_loc = gl.glGetUniformLocation(self.shader, "uLightDir")
-
-        gl.glUniformMatrix4fv(mvp_loc, 1, gl.GL_TRUE, mvp)
-        gl.glUniformMatrix4fv(model_loc, 1, gl.GL_TRUE, model)
-        gl.glUniform1i(tex_loc, 0)
-
-        # Light direction (normalized)
-        light_dir = np.array([0.5, 0.3, 0.8], dtype=np.float32)
-        light_dir /= np.linalg.norm(light_dir)
-        gl.glUniform3fv(light_loc, 1, light_dir)
+        if self.gpu_skinning:
+            tex_shader, flat_shader = self.skin_shader_tex, self.skin_shader_flat
+        else:
+            tex_shader, flat_shader = self.shader_tex, self.shader_flat
 
         gl.glBindVertexArray(self.vao)
 
         if self.parser.batches and self.parser.submeshes:
-            # Per-batch rendering
-            for bi, batch in enumerate(self.parser.batches):
-                si = batch.submesh_index
-                if si >= len(self.parser.submeshes):
-                    continue
-                sm = self.parser.submeshes[si]
-
-                # Bind texture if available
-                gl_tex = self.batch_texture_map.get(bi)
-                if gl_tex:
-                    gl.glActiveTexture(gl.GL_TEXTURE0)
-                    gl.glBindTexture(gl.GL_TEXTURE_2D, gl_tex)
-                    gl.glUniform1i(has_tex_loc, 1)
-                else:
-                    gl.glUniform1i(has_tex_loc, 0)
-
-                # Draw this submesh's triangles
-                idx_start = sm.index_start
-                idx_count = sm.index_count
-                if idx_start + idx_count <= self.n_indices:
-                    gl.glDrawElements(gl.GL_TRIANGLES, idx_count, gl.GL_UNSIGNED_SHORT,
-                                      gl.ctypes.c_void_p(idx_start * 2))
+            # Per-batch rendering, grouped by texture; bind only when it changes. Untextured
+            # draws sort first, so the program switches at most once per frame.
+            gl.glActiveTexture(gl.GL_TEXTURE0)
+            current_tex = -1
+            current_shader = 0
+            for gl_tex, idx_start, idx_count in self.render_list:
+                if gl_tex != current_tex:
+                    shader = tex_shader if gl_tex else flat_shader
+                    if shader != current_shader:
+                        self._use_model_program(shader, mvp, model)
+                        current_shader = shader
+                    if gl_tex:
+                        gl.glBindTexture(gl.GL_TEXTURE_2D, gl_tex)
+                    current_tex = gl_tex
+                gl.glDrawElements(gl.GL_TRIANGLES, idx_count, self.idx_type,
+                                  gl.ctypes.c_void_p(idx_start * self.idx_size))
         else:
             # Fallback: draw all triangles with no texture
-            gl.glUniform1i(has_tex_loc, 0)
-            gl.glDrawElements(gl.GL_TRIANGLES, self.n_indices, gl.GL_UNSIGNED_SHORT,
+            self._use_model_program(flat_shader, mvp, model)
+            gl.glDrawElements(gl.GL_TRIANGLES, self.n_indices, self.idx_type,
                               gl.ctypes.c_void_p(0))
 
         gl.glBindVertexArray(0)
 
-        # Wireframe overlay
-        if self.show_wireframe and self.wire_vao and self.n_wire_indices > 0:
-            gl.glUseProgram(self.wire_shader)
-            wire_mvp_loc = gl.glGetUniformLocation(self.wire_shader, "uMVP")
-            gl.glUniformMatrix4fv(wire_mvp_loc, 1, gl.GL_TRUE, mvp)
+        # Wireframe overlay: same VAO and indices, the wire shaders only read aPos
+        if self.show_wireframe:
+            wire_shader = self.skin_wire_shader if self.gpu_skinning else self.wire_shader
+            gl.glUseProgram(wire_shader)
+            wire_mvp_loc = self.uniforms[wire_shader]["uMVP"]
+            gl.glUniformMatrix4fv(wire_mvp_loc, 1, gl.GL_FALSE, mvp)
 
             gl.glEnable(gl.GL_BLEND)
             gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
             gl.glPolygonMode(gl.GL_FRONT_AND_BACK, gl.GL_LINE)
             gl.glDisable(gl.GL_CULL_FACE)
 
-            gl.glBindVertexArray(self.wire_vao)
-            gl.glDrawElements(gl.GL_TRIANGLES, self.n_wire_indices, gl.GL_UNSIGNED_SHORT,
+            gl.glBindVertexArray(self.vao)
+            gl.glDrawElements(gl.GL_TRIANGLES, self.n_indices, self.idx_type,
                               gl.ctypes.c_void_p(0))
             gl.glBindVertexArray(0)
 
@@ -1159,6 +1828,14 @@ class M2ViewerWindow:
         self.fps_clock = None
         self.font = None
 
+        # Persistent HUD texture, re-uploaded only when the text changes
+        self._hud_tex = 0
+        self._hud_size = (0, 0)
+        self._hud_lines: tuple[str, ...] | None = None
+        self._hud_uploader: _PixelUploader | None = None
+        self._hud_surf = None  # pygame.Surface in RGBA byte order, reused while the size holds
+        self._blitter: _QuadBlitter | None = None
+
         self._dragging = False
         self._panning = False
         self._last_mouse = (0, 0)
@@ -1167,80 +1844,81 @@ class M2ViewerWindow:
         """Main entry point — parse, init GL, run loop."""
         import pygame
         from pygame.locals import (
-            DOUBLEBUF, OPENGL, RESIZABLE, QUIT, KEYDOWN, MOUSEBUTTONDOWN,
-            MOUSEBUTTONUP, MOUSEMOTION, VIDEORESIZE,
+            QUIT, KEYDOWN, MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION, VIDEORESIZE,
             K_SPACE, K_LEFT, K_RIGHT, K_PLUS, K_MINUS, K_EQUALS, K_r, K_w,
             K_ESCAPE,
         )
 
-        # Parse M2
-        data = Path(self.m2_path).read_bytes()
-        if len(data) < 8 or data[:4] != b"MD20":
-            print(f"Not a valid M2 file: {self.m2_path}")
-            return
+        # Parse on a background thread while the window and GL context come up
+        loader = threading.Thread(target=self._background_load, name="m2-load", daemon=True)
+        loader.start()
 
-        self.parser = M2Parser(data)
+        # Init Pygame + OpenGL
+        pygame.init()
+        pygame.display.set_caption(f"M2 Viewer — {Path(self.m2_path).name}")
+        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MAJOR_VERSION, 3)
+        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MINOR_VERSION, 3)
+        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK,
+                                        pygame.GL_CONTEXT_PROFILE_CORE)
+        vsync = self._set_mode(pygame)
 
-        # Load skin file
-        m2_p = Path(self.m2_path)
-        skin_path = m2_p.with_name(m2_p.stem + "00.skin")
-        if skin_path.exists():
-            self.parser.parse_skin_data(skin_path.read_bytes())
-        elif self.parser.is_vanilla:
-            # Embedded skin at ofsViews
-            if self.parser.version <= 256:
-                # Read ofsViews from vanilla header
-                if len(data) > 108:
-                    ofs_views = struct.unpack_from("<I", data, 100)[0]
-                    if ofs_views > 0 and ofs_views < len(data):
-                        self.parser.parse_skin_data(data[ofs_views:])
+        self.fps_clock = pygame.time.Clock()
+        self.font = pygame.font.SysFont("monospace", 14)
 
-        # Init animation
-        self.anim_system = AnimationSystem(self.parser)
-        if self.parser.animations:
-            self.anim_system.set_sequence(0)
-
-        # Auto-fit camera
-        if len(self.parser.positions) > 0:
-            mins = self.parser.positions.min(axis=0)
-            maxs = self.parser.positions.max(axis=0)
-            center = (mins + maxs) / 2.0
-            extent = np.linalg.norm(maxs - mins)
-            self.camera.target = center
-            self.camera.distance = max(extent * 1.2, 1.0)
+        import OpenGL.GL as gl
 
-        # Init Pygame + OpenGL
-        pygame.init()
-        pygame.display.set_caption(f"M2 Viewer — {Path(self.m2_path).name}")
-        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MAJOR_VERSION, 3)
-        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MINOR_VERSION, 3)
-        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK,
-                                        pygame.GL_CONTEXT_PROFILE_CORE)
-        pygame.display.set_mode((self.width, self.height), DOUBLEBUF | OPENGL | RESIZABLE)
+        gl.glClearColor(0.12, 0.12, 0.18, 1.0)
 
-        self.fps_clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont("monospace", 14)
+        # Placeholder frames until parsing finishes
+        while loader.is_alive():
+            self.fps_clock.tick(30)
+            for event in pygame.event.get():
+                if event.type == QUIT:
+                    self.running = False
+            if not self.running:
+                pygame.quit()
+                return
+            gl.glViewport(0, 0, self.width, self.height)
+            gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+            self._draw_text(pygame, gl, [Path(self.m2_path).name, "Loading..."])
+            pygame.display.flip()
+        loader.join()
 
-        import OpenGL.GL as gl
+        if self.parser is None:
+            print(f"Not a valid M2 file: {self.m2_path}")
+            pygame.quit()
+            return
 
-        # Init renderer
+        # Init renderer (needs the GL context, so it stays on this thread)
         self.renderer = M2Renderer(self.parser, self.blp_paths, self.blp_convert)
         self.renderer.init_gl()
 
-        gl.glClearColor(0.12, 0.12, 0.18, 1.0)
         gl.glEnable(gl.GL_DEPTH_TEST)
 
+        # Projection only changes on resize; the model transform never changes
+        proj = perspective(45.0, self.width / max(self.height, 1), 0.01, 5000.0)
+        # Column-major MVP, uploaded without a driver-side transpose
+        mvp = np.empty((4, 4), dtype=np.float32)
+
+        # With vsync the swap paces frames; the clock cap then only guards against a
+        # driver ignoring the swap interval, and stays above common refresh rates
+        fps_cap = 240 if vsync else 60
+        prev_ns = time.monotonic_ns()
+
         # Main loop
         while self.running:
-            dt = self.fps_clock.tick(60) / 1000.0
+            self.fps_clock.tick(fps_cap)  # also feeds get_fps() for the HUD
+            now_ns = time.monotonic_ns()
+            dt = (now_ns - prev_ns) * 1e-9  # not quantized to whole milliseconds
+            prev_ns = now_ns
 
             for event in pygame.event.get():
                 if event.type == QUIT:
                     self.running = False
                 elif event.type == VIDEORESIZE:
                     self.width, self.height = event.w, event.h
-                    pygame.display.set_mode((self.width, self.height),
-                                            DOUBLEBUF | OPENGL | RESIZABLE)
+                    self._set_mode(pygame)
+                    perspective(45.0, self.width / max(self.height, 1), 0.01, 5000.0, out=proj)
                 elif event.type == KEYDOWN:
                     self._handle_key(event.key)
                 elif event.type == MOUSEBUTTONDOWN:
@@ -1271,10 +1949,11 @@ class M2ViewerWindow:
                         self.camera.pan(-dx, dy)
                         self._last_mouse = event.pos
 
-            # Update animation + skinning
-            if self.anim_system:
-                self.anim_system.update(dt)
-                if (len(self.anim_system.bone_matrices) > 0
+            # Update animation + skinning; an unchanged pose is already on the GPU
+            if self.anim_system and self.anim_system.update(dt):
+                if self.renderer.gpu_skinning:
+                    self.renderer.update_bones(self.anim_system.bone_matrices)
+                elif (len(self.anim_system.bone_matrices) > 0
                         and len(self.parser.bone_lookup) > 0):
                     skinned = self.anim_system.skin_vertices(
                         self.parser.positions,
@@ -1288,13 +1967,10 @@ class M2ViewerWindow:
             gl.glViewport(0, 0, self.width, self.height)
             gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
 
-            aspect = self.width / max(self.height, 1)
-            proj = perspective(45.0, aspect, 0.01, 5000.0)
             view = self.camera.get_view_matrix()
-            model = np.eye(4, dtype=np.float32)
-            mvp = proj @ view @ model
+            np.matmul(view.T, proj.T, out=mvp)  # (proj @ view).T; model is identity
 
-            self.renderer.render(mvp, model)
+            self.renderer.render(mvp, _MODEL_IDENTITY)  # identity: its own transpose
 
             # HUD overlay
             self._draw_hud(pygame, gl)
@@ -1303,6 +1979,59 @@ class M2ViewerWindow:
 
         pygame.quit()
 
+    def _set_mode(self, pygame) -> bool:
+        """Open or resize the GL window, requesting vsync. Returns whether vsync was accepted."""
+        flags = pygame.DOUBLEBUF | pygame.OPENGL | pygame.RESIZABLE
+        try:
+            pygame.display.set_mode((self.width, self.height), flags, vsync=1)
+            return True
+        except (TypeError, pygame.error):
+            # pygame < 2.0 has no vsync argument; some drivers refuse it
+            pygame.display.set_mode((self.width, self.height), flags)
+            return False
+
+    def _background_load(self):
+        """Read and parse the M2 + skin and fit the camera; runs off the GL thread.
+
+        Leaves self.parser as None when the file is not a valid M2.
+        """
+        # Parse M2 (memory-mapped, no up-front read)
+        data = _map_file(self.m2_path)
+        if len(data) < 8 or data[:4] != b"MD20":
+            return
+
+        parser = M2Parser(data)
+
+        # Load skin file
+        m2_p = Path(self.m2_path)
+        skin_path = m2_p.with_name(m2_p.stem + "00.skin")
+        if skin_path.exists():
+            parser.parse_skin_data(skin_path)
+        elif parser.is_vanilla:
+            # Embedded skin at ofsViews
+            if parser.version <= 256:
+                # Read ofsViews from vanilla header
+                if len(data) > 108:
+                    ofs_views = _SI.unpack_from(data, 100)[0]
+                    if ofs_views > 0 and ofs_views < len(data):
+                        parser.parse_skin_data(memoryview(data)[ofs_views:])
+
+        # Init animation
+        self.anim_system = AnimationSystem(parser)
+        if parser.animations:
+            self.anim_system.set_sequence(0)
+
+        # Auto-fit camera
+        if len(parser.positions) > 0:
+            mins = parser.positions.min(axis=0)
+            maxs = parser.positions.max(axis=0)
+            center = (mins + maxs) / 2.0
+            extent = np.linalg.norm(maxs - mins)
+            self.camera.target = center
+            self.camera.distance = max(extent * 1.2, 1.0)
+
+        self.parser = parser
+
     def _handle_key(self, key):
         import pygame
         if key == pygame.K_ESCAPE:
@@ -1361,122 +2090,129 @@ class M2ViewerWindow:
         lines.append("Space: play/pause | Left/Right: anim | +/-: speed")
         lines.append("W: wireframe | R: reset | Esc: quit")
 
-        # Render text to surface, then blit via orthographic projection
-        # Use a simple texture-based approach
+        self._draw_text(pygame, gl, lines)
+
+    def _draw_text(self, pygame, gl, lines: list[str]):
+        """Draw text lines in the top-left HUD box."""
+        # Most frames show the same text: reuse the uploaded texture as-is
+        if tuple(lines) != self._hud_lines:
+            self._hud_lines = tuple(lines)
+            self._upload_hud(pygame, gl, lines)
+
+        surf_width, total_height = self._hud_size
+        self._blit_texture(gl, self._hud_tex, 8, self.height - total_height - 8, surf_width, total_height)
+
+    def _upload_hud(self, pygame, gl, lines: list[str]):
+        """Rasterize HUD lines and upload them into the persistent HUD texture."""
         line_height = 18
         total_height = len(lines) * line_height + 8
         surf_width = 450
-        surf = pygame.Surface((surf_width, total_height), pygame.SRCALPHA)
+        if self._hud_surf is None or self._hud_surf.get_size() != (surf_width, total_height):
+            self._hud_surf = pygame.Surface((surf_width, total_height), pygame.SRCALPHA, 32,
+                                            masks=_RGBA_MASKS)
+        surf = self._hud_surf
         surf.fill((0, 0, 0, 160))
 
         for i, line in enumerate(lines):
             text_surf = self.font.render(line, True, (220, 220, 240))
             surf.blit(text_surf, (6, 4 + i * line_height))
 
-        # Convert to OpenGL texture and draw
-        text_data = pygame.image.tostring(surf, "RGBA", True)
-        tex_id = gl.glGenTextures(1)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, tex_id)
-        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, surf_width, total_height,
-                        0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, text_data)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
-
-        # Draw fullscreen quad in ortho — use compatibility approach with glWindowPos + glDrawPixels
-        # Simpler: use a small shader-less blit via fixed function emulation
-        # Actually, let's just use the modern approach with a screen quad
-        self._blit_texture(gl, tex_id, 8, self.height - total_height - 8, surf_width, total_height)
-
-        gl.glDeleteTextures(1, [tex_id])
+        # Upload straight from the surface pixels, top row first; the blit flips V
+        text_data = np.frombuffer(surf.get_view("1"), dtype=np.uint8)
+        if not self._hud_tex:
+            self._hud_tex = gl.glGenTextures(1)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, self._hud_tex)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
+            self._hud_uploader = _PixelUploader(gl)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self._hud_tex)
+        self._hud_uploader.stage(text_data)
+        if (surf_width, total_height) != self._hud_size:
+            # Storage is reallocated only when the line count changes
+            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, surf_width, total_height,
+                            0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, None)
+            self._hud_size = (surf_width, total_height)
+        else:
+            gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, 0, surf_width, total_height,
+                               gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, None)
+        self._hud_uploader.unbind()
+        del text_data  # releases the surface lock held by the pixel view
 
     def _blit_texture(self, gl, tex_id, x, y, w, h):
-        """Blit a texture to screen at (x,y) using a temporary screen-space quad."""
-        # Simple blit using glBlitFramebuffer alternative:
-        # Create a minimal screen-space shader + quad
-        if not hasattr(self, '_blit_shader'):
-            blit_vert = """
-#version 330 core
-layout(location=0) in vec2 aPos;
-layout(location=1) in vec2 aUV;
-out vec2 vUV;
-void main() {
-    gl_Position = vec4(aPos, 0.0, 1.0);
-    vUV = aUV;
-}
-"""
-            blit_frag = """
-#version 330 core
-in vec2 vUV;
-uniform sampler2D uTex;
-out vec4 FragColor;
-void main() {
-    FragColor = texture(uTex, vUV);
-}
-"""
-            self._blit_shader = self.renderer._compile_program(blit_vert, blit_frag)
-            self._blit_vao = gl.glGenVertexArrays(1)
-            self._blit_vbo = gl.glGenBuffers(1)
-
-        # Convert pixel coords to NDC
-        x0 = 2.0 * x / self.width - 1.0
-        y0 = 2.0 * y / self.height - 1.0
-        x1 = 2.0 * (x + w) / self.width - 1.0
-        y1 = 2.0 * (y + h) / self.height - 1.0
-
-        quad = np.array([
-            x0, y0, 0.0, 0.0,
-            x1, y0, 1.0, 0.0,
-            x1, y1, 1.0, 1.0,
-            x0, y0, 0.0, 0.0,
-            x1, y1, 1.0, 1.0,
-            x0, y1, 0.0, 1.0,
-        ], dtype=np.float32)
-
-        gl.glBindVertexArray(self._blit_vao)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._blit_vbo)
-        gl.glBufferData(gl.GL_ARRAY_BUFFER, quad.nbytes, quad, gl.GL_DYNAMIC_DRAW)
-        gl.glVertexAttribPointer(0, 2, gl.GL_FLOAT, gl.GL_FALSE, 16, gl.ctypes.c_void_p(0))
-        gl.glEnableVertexAttribArray(0)
-        gl.glVertexAttribPointer(1, 2, gl.GL_FLOAT, gl.GL_FALSE, 16, gl.ctypes.c_void_p(8))
-        gl.glEnableVertexAttribArray(1)
-
-        gl.glDisable(gl.GL_DEPTH_TEST)
-        gl.glEnable(gl.GL_BLEND)
-        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
-
-        gl.glUseProgram(self._blit_shader)
-        gl.glActiveTexture(gl.GL_TEXTURE0)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, tex_id)
-        gl.glUniform1i(gl.glGetUniformLocation(self._blit_shader, "uTex"), 0)
-
-        gl.glDrawArrays(gl.GL_TRIANGLES, 0, 6)
-
-        gl.glBindVertexArray(0)
-        gl.glEnable(gl.GL_DEPTH_TEST)
-        gl.glDisable(gl.GL_BLEND)
+        """Blit a texture to screen at (x,y) by stretching a fixed unit quad."""
+        if self._blitter is None:
+            self._blitter = _QuadBlitter(gl)
+        self._blitter.draw(tex_id, x, y, w, h, self.width, self.height)
 
 
 # ---------------------------------------------------------------------------
 # WMO Parser
 # ---------------------------------------------------------------------------
 
-@dataclass
-class WMOBatch:
-    start_index: int = 0
-    index_count: int = 0
-    material_id: int = 0
-
-
-@dataclass
-class WMOMaterial:
-    flags: int = 0
-    shader: int = 0
-    blend_mode: int = 0
-    texture1_ofs: int = 0
-    texture2_ofs: int = 0
-    texture3_ofs: int = 0
-    color1: int = 0
-    color2: int = 0
+# SMOBatch (24 bytes): bounding box, index range, vertex range, flags, material
+_WMO_BATCH_DTYPE = np.dtype([
+    ("bbox", "<i2", (6,)),
+    ("start_index", "<u4"),
+    ("index_count", "<u2"),
+    ("start_vertex", "<u2"),
+    ("last_vertex", "<u2"),
+    ("flags", "u1"),
+    ("material_id", "u1"),
+])
+
+
+# SMOMaterial (64 bytes); texture fields are byte offsets into MOTX
+_WMO_MATERIAL_DTYPE = np.dtype([
+    ("flags", "<u4"),
+    ("shader", "<u4"),
+    ("blend_mode", "<u4"),
+    ("texture1_ofs", "<u4"),
+    ("color1", "<u4"),
+    ("frame_color1", "V4"),
+    ("texture2_ofs", "<u4"),
+    ("color2", "<u4"),
+    ("ground_type", "V4"),
+    ("texture3_ofs", "<u4"),
+    ("rest", "V24"),
+])
+
+
+def _chunk_tag(cid: bytes) -> int:
+    """Tag that _scan_chunks reports for chunk id `cid` ("MOVT") as WMO files store it.
+
+    Files write the id reversed ("TVOM"); read as a little-endian uint32 that is
+    the id's big-endian value.
+    """
+    return int.from_bytes(cid, "big")
+
+
+def _swap_tag(tag: int) -> int:
+    """The same chunk id stored in forward order."""
+    return int.from_bytes(tag.to_bytes(4, "big"), "little")
+
+
+_TAG_MOHD = _chunk_tag(b"MOHD")
+_TAG_MOTX = _chunk_tag(b"MOTX")
+_TAG_MOMT = _chunk_tag(b"MOMT")
+_TAG_MOGP = _chunk_tag(b"MOGP")
+_TAG_MOVT = _chunk_tag(b"MOVT")
+_TAG_MOVI = _chunk_tag(b"MOVI")
+_TAG_MONR = _chunk_tag(b"MONR")
+_TAG_MOTV = _chunk_tag(b"MOTV")
+_TAG_MOBA = _chunk_tag(b"MOBA")
+
+
+def _scan_chunks(data: Any, pos: int, end: int) -> Iterator[tuple[int, int, int]]:
+    """Walk chunk headers in data[pos:end], yielding (data start, size, tag).
+
+    Tags are the raw header ids as little-endian uint32s, not normalized; compare them
+    against _chunk_tag() values (and _swap_tag() ones for forward-order files). A
+    chunk that runs past `end` is still reported, as the last entry.
+    """
+    while pos + 8 <= end:
+        tag, chunk_size = _CHUNK_HDR.unpack_from(data, pos)
+        yield pos + 8, chunk_size, tag
+        pos += 8 + chunk_size
 
 
 @dataclass
@@ -1485,7 +2221,83 @@ class WMOGroup:
     normals: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=np.float32))
     uvs: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.float32))
     indices: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint16))
-    batches: list = field(default_factory=list)
+    batches: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=_WMO_BATCH_DTYPE))
+    # Bounding box of `positions`, for frustum culling
+    aabb_min: np.ndarray = field(default_factory=lambda: np.zeros(3, dtype=np.float32))
+    aabb_max: np.ndarray = field(default_factory=lambda: np.zeros(3, dtype=np.float32))
+
+
+# Chunk handlers, dispatched on the tag from _scan_chunks. Each gets the
+# target, the file buffer and the chunk's data start and size.
+
+def _read_mohd(parser: WMOParser, data: Any, start: int, size: int):
+    if size >= 16:
+        # nTextures at +0, nGroups at +4
+        parser.n_groups_expected = _SI.unpack_from(data, start + 4)[0]
+
+
+def _read_motx(parser: WMOParser, data: Any, start: int, size: int):
+    # Null-terminated string block, padded with extra nulls. The part after
+    # the last null is unterminated and ignored.
+    off = 0
+    for name in bytes(data[start:start + size]).split(b"\x00")[:-1]:
+        if name:
+            parser.texture_offset_map[off] = len(parser.textures)
+            parser.textures.append(name.decode("ascii", errors="replace"))
+        off += len(name) + 1
+
+
+def _read_momt(parser: WMOParser, data: Any, start: int, size: int):
+    parser.materials = np.frombuffer(data, dtype=_WMO_MATERIAL_DTYPE,
+                                     count=size // 64, offset=start).copy()
+
+
+def _read_movt(group: WMOGroup, data: Any, start: int, size: int):
+    n = size // 12
+    group.positions = np.frombuffer(data, dtype="<f4", count=n * 3, offset=start).reshape(n, 3).copy()
+    if n:
+        group.aabb_min = group.positions.min(axis=0)
+        group.aabb_max = group.positions.max(axis=0)
+
+
+def _read_movi(group: WMOGroup, data: Any, start: int, size: int):
+    group.indices = np.frombuffer(data, dtype=np.uint16, count=size // 2, offset=start).copy()
+
+
+def _read_monr(group: WMOGroup, data: Any, start: int, size: int):
+    n = size // 12
+    group.normals = np.frombuffer(data, dtype="<f4", count=n * 3, offset=start).reshape(n, 3).copy()
+
+
+def _read_motv(group: WMOGroup, data: Any, start: int, size: int):
+    n = size // 8
+    group.uvs = np.frombuffer(data, dtype="<f4", count=n * 2, offset=start).reshape(n, 2).copy()
+
+
+def _read_moba(group: WMOGroup, data: Any, start: int, size: int):
+    group.batches = np.frombuffer(data, dtype=_WMO_BATCH_DTYPE, count=size // 24, offset=start).copy()
+
+
+def _with_forward_tags(handlers: dict[int, Any]) -> dict[int, Any]:
+    """Also key each handler by its forward-order tag, for files that store ids unreversed."""
+    return {**handlers, **{_swap_tag(tag): h for tag, h in handlers.items()}}
+
+
+_WMO_ROOT_HANDLERS: dict[int, Callable[[WMOParser, Any, int, int], None]] = _with_forward_tags({
+    _TAG_MOHD: _read_mohd,
+    _TAG_MOTX: _read_motx,
+    _TAG_MOMT: _read_momt,
+})
+
+_WMO_GROUP_HANDLERS: dict[int, Callable[[WMOGroup, Any, int, int], None]] = _with_forward_tags({
+    _TAG_MOVT: _read_movt,
+    _TAG_MOVI: _read_movi,
+    _TAG_MONR: _read_monr,
+    _TAG_MOTV: _read_motv,
+    _TAG_MOBA: _read_moba,
+})
+
+_MOGP_TAGS = frozenset((_TAG_MOGP, _swap_tag(_TAG_MOGP)))
 
 
 class WMOParser:
@@ -1494,130 +2306,40 @@ class WMOParser:
     def __init__(self):
         self.textures: list[str] = []
         self.texture_offset_map: dict[int, int] = {}  # MOTX byte offset -> texture index
-        self.materials: list[WMOMaterial] = []
+        self.materials: np.ndarray = np.empty(0, dtype=_WMO_MATERIAL_DTYPE)  # one record per material
         self.groups: list[WMOGroup] = []
         self.n_groups_expected: int = 0
 
-    def parse_root(self, data: bytes):
+    def parse_root(self, data: bytes | mmap.mmap):
         """Parse root WMO file for textures and materials."""
-        pos = 0
-        while pos + 8 <= len(data):
-            chunk_id = data[pos:pos + 4]
-            chunk_size = struct.unpack_from("<I", data, pos + 4)[0]
-            chunk_start = pos + 8
-            chunk_end = chunk_start + chunk_size
-
-            if chunk_end > len(data):
+        for chunk_start, chunk_size, tag in _scan_chunks(data, 0, len(data)):
+            if chunk_start + chunk_size > len(data):
                 break
+            handler = _WMO_ROOT_HANDLERS.get(tag)
+            if handler:
+                handler(self, data, chunk_start, chunk_size)
 
-            cid = chunk_id if chunk_id[:1] == b"M" else chunk_id[::-1]
-
-            if cid == b"MOHD" and chunk_size >= 16:
-                # nTextures at +0, nGroups at +4
-                self.n_groups_expected = struct.unpack_from("<I", data, chunk_start + 4)[0]
-
-            elif cid == b"MOTX":
-                # Null-terminated string block
-                off = 0
-                tex_idx = 0
-                while off < chunk_size:
-                    end = data.find(b"\x00", chunk_start + off, chunk_end)
-                    if end < 0:
-                        break
-                    s = data[chunk_start + off:end].decode("ascii", errors="replace")
-                    if s:
-                        self.texture_offset_map[off] = tex_idx
-                        self.textures.append(s)
-                        tex_idx += 1
-                        off = end - chunk_start + 1
-                    else:
-                        off += 1
-
-            elif cid == b"MOMT":
-                n_mats = chunk_size // 64
-                for i in range(n_mats):
-                    base = chunk_start + i * 64
-                    fields = struct.unpack_from("<16I", data, base)
-                    mat = WMOMaterial()
-                    mat.flags = fields[0]
-                    mat.shader = fields[1]
-                    mat.blend_mode = fields[2]
-                    mat.texture1_ofs = fields[3]
-                    mat.color1 = fields[4]
-                    mat.texture2_ofs = fields[6]
-                    mat.color2 = fields[7]
-                    mat.texture3_ofs = fields[9]
-                    self.materials.append(mat)
-
-            pos = chunk_end
-
-    def parse_group(self, data: bytes) -> WMOGroup:
+    def parse_group(self, data: bytes | mmap.mmap) -> WMOGroup:
         """Parse a WMO group file for geometry."""
         group = WMOGroup()
-        pos = 0
 
         # Scan for MOGP chunk which wraps all sub-chunks
         mogp_start = -1
         mogp_end = len(data)
-        while pos + 8 <= len(data):
-            chunk_id = data[pos:pos + 4]
-            chunk_size = struct.unpack_from("<I", data, pos + 4)[0]
-            cid = chunk_id if chunk_id[:1] == b"M" else chunk_id[::-1]
-            if cid == b"MOGP":
-                mogp_start = pos + 8 + 68  # Skip MOGP header (68 bytes)
-                mogp_end = pos + 8 + chunk_size
+        for chunk_start, chunk_size, tag in _scan_chunks(data, 0, len(data)):
+            if tag in _MOGP_TAGS:
+                mogp_start = chunk_start + 68  # Skip MOGP header (68 bytes)
+                mogp_end = chunk_start + chunk_size
                 break
-            pos += 8 + chunk_size
 
         # Parse sub-chunks inside MOGP (or scan whole file if no MOGP found)
         scan_start = mogp_start if mogp_start >= 0 else 0
-        pos = scan_start
-        while pos + 8 <= mogp_end:
-            chunk_id = data[pos:pos + 4]
-            chunk_size = struct.unpack_from("<I", data, pos + 4)[0]
-            chunk_start = pos + 8
-            chunk_end = chunk_start + chunk_size
-
-            if chunk_end > mogp_end:
+        for chunk_start, chunk_size, tag in _scan_chunks(data, scan_start, min(mogp_end, len(data))):
+            if chunk_start + chunk_size > mogp_end:
                 break
-
-            cid = chunk_id if chunk_id[:1] == b"M" else chunk_id[::-1]
-
-            if cid == b"MOVT":
-                n = chunk_size // 12
-                group.positions = np.zeros((n, 3), dtype=np.float32)
-                for i in range(n):
-                    group.positions[i] = struct.unpack_from("<3f", data, chunk_start + i * 12)
-
-            elif cid == b"MOVI":
-                n = chunk_size // 2
-                group.indices = np.frombuffer(data, dtype=np.uint16,
-                                              count=n, offset=chunk_start).copy()
-
-            elif cid == b"MONR":
-                n = chunk_size // 12
-                group.normals = np.zeros((n, 3), dtype=np.float32)
-                for i in range(n):
-                    group.normals[i] = struct.unpack_from("<3f", data, chunk_start + i * 12)
-
-            elif cid == b"MOTV":
-                n = chunk_size // 8
-                group.uvs = np.zeros((n, 2), dtype=np.float32)
-                for i in range(n):
-                    group.uvs[i] = struct.unpack_from("<2f", data, chunk_start + i * 8)
-
-            elif cid == b"MOBA":
-                n = chunk_size // 24
-                for i in range(n):
-                    base = chunk_start + i * 24
-                    batch = WMOBatch()
-                    batch.start_index = struct.unpack_from("<I", data, base + 12)[0]
-                    batch.index_count = struct.unpack_from("<H", data, base + 16)[0]
-                    # skip startVertex(2) + lastVertex(2) + flags(1)
-                    batch.material_id = struct.unpack_from("<B", data, base + 23)[0]
-                    group.batches.append(batch)
-
-            pos = chunk_end
+            handler = _WMO_GROUP_HANDLERS.get(tag)
+            if handler:
+                handler(group, data, chunk_start, chunk_size)
 
         return group
 
@@ -1629,10 +2351,89 @@ class WMOParser:
         return ""
 
 
+def _parse_wmo_group(path: str) -> WMOGroup:
+    """Parse one WMO group file (memory-mapped; the group keeps copies, so the mapping drops)."""
+    return WMOParser().parse_group(_map_file(path))
+
+
 # ---------------------------------------------------------------------------
 # WMO Renderer
 # ---------------------------------------------------------------------------
 
+def _extract_frustum_planes(mvp: np.ndarray) -> np.ndarray:
+    """Clip-space frustum planes (6, 4) of a row-major MVP (Gribb-Hartmann).
+
+    A point p is inside plane (a, b, c, d) when a*x + b*y + c*z + d >= 0.
+    """
+    r0, r1, r2, r3 = mvp
+    return np.stack([r3 + r0, r3 - r0, r3 + r1, r3 - r1, r3 + r2, r3 - r2])
+
+
+def _aabbs_in_frustum(planes: np.ndarray, mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+    """Per-box visibility (n,) for boxes (n, 3): False only when a box is fully outside a plane."""
+    normals = planes[:, :3]
+    # The box corner furthest along each plane normal, per box and plane: (n, 6, 3)
+    corner = np.where(normals >= 0, maxs[:, None, :], mins[:, None, :])
+    dist = np.einsum("npk,pk->np", corner, normals) + planes[:, 3]
+    return (dist >= 0).all(axis=1)
+
+
+# Per-frame state shared by the WMO programs through one uniform buffer (binding 0)
+_WMO_FRAME_GLSL = """
+#version 330 core
+layout(std140, row_major) uniform Frame {
+    mat4 uMVP;
+    mat4 uModel;
+    vec4 uLightDir;
+};
+"""
+
+WMO_VERT_SHADER = _WMO_FRAME_GLSL + """
+layout(location=0) in vec3 aPos;
+layout(location=1) in vec3 aNormal;
+layout(location=2) in vec2 aUV;
+
+out vec3 vNormal;
+out vec2 vUV;
+
+void main() {
+    gl_Position = uMVP * vec4(aPos, 1.0);
+    vNormal = mat3(uModel) * aNormal;
+    vUV = aUV;
+}
+"""
+
+# Untextured materials sample a 1x1 texture holding the flat color, so there is no
+# per-batch branch or uniform toggle
+WMO_FRAG_SHADER = _WMO_FRAME_GLSL + """
+in vec3 vNormal;
+in vec2 vUV;
+
+uniform sampler2D uTexture;
+
+out vec4 FragColor;
+
+void main() {
+    vec3 N = normalize(vNormal);
+    float light = 0.35 + 0.65 * abs(dot(N, uLightDir.xyz));
+
+    vec4 texColor = texture(uTexture, vUV);
+    if (texColor.a < 0.1) discard;
+
+    FragColor = vec4(texColor.rgb * light, texColor.a);
+}
+"""
+
+WMO_WIRE_VERT = _WMO_FRAME_GLSL + """
+layout(location=0) in vec3 aPos;
+void main() {
+    gl_Position = uMVP * vec4(aPos, 1.0);
+}
+"""
+
+_WMO_FLAT_COLOR = np.array([153, 153, 166, 255], dtype=np.uint8)  # (0.6, 0.6, 0.65, 1.0)
+
+
 class WMORenderer:
     """OpenGL 3.3 renderer for WMO models."""
 
@@ -1642,15 +2443,27 @@ class WMORenderer:
         self.blp_convert_path = blp_convert
         self.show_wireframe = False
 
-        # Per-group GL state
-        self._group_vaos: list[int] = []
-        self._group_vbos: list[int] = []
-        self._group_ebos: list[int] = []
-        self._group_n_indices: list[int] = []
-        self._group_batches: list[list[WMOBatch]] = []
+        # All groups share one VAO/VBO/EBO; each group is drawn with its own base vertex
+        self.vao = 0
+        self.vbo = 0
+        self.ebo = 0
+        self._group_ranges: list[tuple[int, int, int]] = []  # (first index, index count, base vertex)
+        self._group_batches: list[list[tuple[int, int, int]]] = []  # (start, count, material)
+        self._group_aabbs = (np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.float32))
+        # glMultiDrawElementsBaseVertex arguments covering every group, for the wireframe pass,
+        # plus the group each entry belongs to
+        self._wire_draw = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.uintp),
+                           np.empty(0, dtype=np.int32), np.empty(0, dtype=np.intp))
+        # Per GL texture: (texture, (counts, offsets, base vertices, groups)) for one multi-draw
+        self._tex_draws: list[tuple[int, tuple[np.ndarray, ...]]] = []
 
         self.shader = 0
         self.wire_shader = 0
+        self.frame_ubo = 0
+        # std140 Frame block: uMVP, uModel (row-major), uLightDir (xyz + pad)
+        self._frame_data = np.zeros(36, dtype=np.float32)
+        self._frame_data[32:35] = _LIGHT_DIR
+        self._flat_tex = 0  # 1x1 texture for untextured materials
         self._gl = None
 
         # material_id -> GL texture id
@@ -1660,47 +2473,47 @@ class WMORenderer:
         import OpenGL.GL as gl
         self._gl = gl
 
-        self.shader = self._compile_program(VERT_SHADER, FRAG_SHADER)
-        self.wire_shader = self._compile_program(WIRE_VERT, WIRE_FRAG)
+        self.shader = self._compile_program(WMO_VERT_SHADER, WMO_FRAG_SHADER)
+        self.wire_shader = self._compile_program(WMO_WIRE_VERT, WIRE_FRAG)
+        for prog in (self.shader, self.wire_shader):
+            gl.glUniformBlockBinding(prog, gl.glGetUniformBlockIndex(prog, "Frame"), 0)
+        # The sampler always reads texture unit 0; set it once
+        gl.glUseProgram(self.shader)
+        gl.glUniform1i(gl.glGetUniformLocation(self.shader, "uTexture"), 0)
+        gl.glUseProgram(0)
+
+        self.frame_ubo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self.frame_ubo)
+        gl.glBufferData(gl.GL_UNIFORM_BUFFER, self._frame_data.nbytes, self._frame_data, gl.GL_DYNAMIC_DRAW)
+        gl.glBindBufferBase(gl.GL_UNIFORM_BUFFER, 0, self.frame_ubo)
+
+        self._flat_tex = gl.glGenTextures(1)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self._flat_tex)
+        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, 1, 1, 0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE,
+                        _WMO_FLAT_COLOR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
 
         self._load_textures()
 
-        for group in self.parser.groups:
-            self._upload_group(group)
+        groups = self.parser.groups
+        total_verts = sum(len(g.positions) for g in groups)
+        total_indices = sum(len(g.indices) for g in groups if len(g.positions))
 
-    def _upload_group(self, group: WMOGroup):
-        gl = self._gl
-        n_verts = len(group.positions)
-        if n_verts == 0:
-            self._group_vaos.append(0)
-            self._group_vbos.append(0)
-            self._group_ebos.append(0)
-            self._group_n_indices.append(0)
-            self._group_batches.append([])
-            return
+        self.vao = gl.glGenVertexArrays(1)
+        self.vbo = gl.glGenBuffers(1)
+        self.ebo = gl.glGenBuffers(1)
+        gl.glBindVertexArray(self.vao)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, total_verts * 32, None, gl.GL_STATIC_DRAW)
+        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        gl.glBufferData(gl.GL_ELEMENT_ARRAY_BUFFER, total_indices * 2, None, gl.GL_STATIC_DRAW)
 
-        # Interleaved: pos(12) + normal(12) + uv(8) = 32 bytes
-        vbo_data = np.zeros((n_verts, 8), dtype=np.float32)
-        vbo_data[:, 0:3] = group.positions
-        if len(group.normals) == n_verts:
-            vbo_data[:, 3:6] = group.normals
-        if len(group.uvs) == n_verts:
-            vbo_data[:, 6:8] = group.uvs
-
-        vao = gl.glGenVertexArrays(1)
-        vbo = gl.glGenBuffers(1)
-        ebo = gl.glGenBuffers(1)
-
-        gl.glBindVertexArray(vao)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, vbo)
-        gl.glBufferData(gl.GL_ARRAY_BUFFER, vbo_data.nbytes, vbo_data, gl.GL_STATIC_DRAW)
-
-        n_idx = 0
-        if len(group.indices) > 0:
-            idx_data = group.indices.astype(np.uint16)
-            n_idx = len(idx_data)
-            gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, ebo)
-            gl.glBufferData(gl.GL_ELEMENT_ARRAY_BUFFER, idx_data.nbytes, idx_data, gl.GL_STATIC_DRAW)
+        base_vertex = first_index = 0
+        for group in groups:
+            self._upload_group(group, base_vertex, first_index)
+            base_vertex += len(group.positions)
+            first_index += self._group_ranges[-1][1]
 
         stride = 32
         gl.glVertexAttribPointer(0, 3, gl.GL_FLOAT, gl.GL_FALSE, stride, gl.ctypes.c_void_p(0))
@@ -1711,80 +2524,151 @@ class WMORenderer:
         gl.glEnableVertexAttribArray(2)
         gl.glBindVertexArray(0)
 
-        self._group_vaos.append(vao)
-        self._group_vbos.append(vbo)
-        self._group_ebos.append(ebo)
-        self._group_n_indices.append(n_idx)
-        self._group_batches.append(group.batches)
+        self._group_aabbs = (np.array([g.aabb_min for g in groups], dtype=np.float32).reshape(-1, 3),
+                             np.array([g.aabb_max for g in groups], dtype=np.float32).reshape(-1, 3))
+        self._wire_draw = self._draw_arrays([(n_idx, first, base, gi) for gi, (first, n_idx, base)
+                                             in enumerate(self._group_ranges) if n_idx])
+        self._build_texture_draws()
+
+    @staticmethod
+    def _draw_arrays(draws: list[tuple[int, int, int, int]]) -> tuple[np.ndarray, ...]:
+        """(count, first index, base vertex, group) rows -> multi-draw argument arrays + groups."""
+        a = np.array(draws, dtype=np.int64).reshape(-1, 4)
+        return (a[:, 0].astype(np.int32), (a[:, 1] * 2).astype(np.uintp),
+                a[:, 2].astype(np.int32), a[:, 3].astype(np.intp))
+
+    @staticmethod
+    def _cull(draw: tuple[np.ndarray, ...], visible: np.ndarray | None) -> tuple[np.ndarray, ...] | None:
+        """Multi-draw arguments restricted to visible groups (None: nothing left to draw)."""
+        counts, offsets, bases, groups = draw
+        if visible is not None:
+            keep = visible[groups]
+            counts, offsets, bases = counts[keep], offsets[keep], bases[keep]
+        return (counts, offsets, bases) if len(counts) else None
+
+    def _build_texture_draws(self):
+        """Bucket every group's batches by GL texture so each texture is one multi-draw."""
+        buckets: dict[int, list[tuple[int, int, int, int]]] = {}  # texture -> [(count, first, base, group)]
+        for gi, ((first, n_idx, base), batches) in enumerate(zip(self._group_ranges, self._group_batches)):
+            if n_idx == 0:
+                continue
+            if not batches:
+                buckets.setdefault(self._flat_tex, []).append((n_idx, first, base, gi))
+                continue
+            for si, ic, material_id in batches:
+                if ic and si + ic <= n_idx:
+                    gl_tex = self._mat_textures.get(material_id, self._flat_tex)
+                    buckets.setdefault(gl_tex, []).append((ic, first + si, base, gi))
+
+        self._tex_draws = [(gl_tex, self._draw_arrays(buckets[gl_tex])) for gl_tex in sorted(buckets)]
+
+    def _upload_group(self, group: WMOGroup, base_vertex: int, first_index: int):
+        """Write one group into the shared VBO/EBO (bound by init_gl) at the given offsets."""
+        gl = self._gl
+        n_verts = len(group.positions)
+        if n_verts == 0:
+            self._group_ranges.append((first_index, 0, base_vertex))
+            self._group_batches.append([])
+            return
+
+        # Interleaved: pos(12) + normal(12) + uv(8) = 32 bytes. Every column is written
+        # exactly once (missing streams as zeros), so no zero-fill pass is needed.
+        vbo_data = np.empty((n_verts, 8), dtype=np.float32)
+        vbo_data[:, 0:3] = group.positions
+        vbo_data[:, 3:6] = group.normals if len(group.normals) == n_verts else 0.0
+        vbo_data[:, 6:8] = group.uvs if len(group.uvs) == n_verts else 0.0
+        gl.glBufferSubData(gl.GL_ARRAY_BUFFER, base_vertex * 32, vbo_data.nbytes, vbo_data)
+
+        # MOVI is parsed as uint16 already; upload it without a copy
+        n_idx = len(group.indices)
+        if n_idx > 0:
+            gl.glBufferSubData(gl.GL_ELEMENT_ARRAY_BUFFER, first_index * 2, group.indices.nbytes,
+                               group.indices)
+
+        self._group_ranges.append((first_index, n_idx, base_vertex))
+        b = group.batches
+        self._group_batches.append(list(zip(b["start_index"].tolist(), b["index_count"].tolist(),
+                                            b["material_id"].tolist())))
 
     def _load_textures(self):
         gl = self._gl
         try:
-            from PIL import Image
+            from PIL import Image  # noqa: F401
         except ImportError:
+            print("PIL not available, textures disabled")
             return
 
         cache_dir = Path(os.path.expanduser("~/.cache/m2_viewer"))
         cache_dir.mkdir(parents=True, exist_ok=True)
 
-        loaded: dict[str, int] = {}  # filename -> GL tex id
-
-        for mat_idx, mat in enumerate(self.parser.materials):
-            tex_name = self.parser.get_texture_name(mat.texture1_ofs)
+        # First pass: resolve each material's texture and collect the BLPs not yet cached
+        index = _load_cache_index(cache_dir)
+        stored_index = dict(index)
+        jobs: dict[str, tuple[str, Path]] = {}  # filename -> (normalized name, cached PNG)
+        mat_tex: list[tuple[int, str]] = []
+        to_convert: dict[Path, tuple[str, str]] = {}
+        for mat_idx, tex_ofs in enumerate(self.parser.materials["texture1_ofs"].tolist()):
+            tex_name = self.parser.get_texture_name(tex_ofs)
             if not tex_name:
                 continue
 
-            if tex_name in loaded:
-                self._mat_textures[mat_idx] = loaded[tex_name]
-                continue
-
-            norm = tex_name.replace("\\", "/")
-            blp_path = self.blp_paths.get(norm) or self.blp_paths.get(norm.lower())
-            if not blp_path:
-                continue
-
-            cache_key = hashlib.md5(blp_path.encode()).hexdigest()
-            cached_png = cache_dir / f"{cache_key}.png"
+            if tex_name not in jobs:
+                norm = tex_name.replace("\\", "/")
+                blp_path = self.blp_paths.get(norm) or self.blp_paths.get(norm.lower())
+                if not blp_path:
+                    continue
 
-            if not cached_png.exists():
                 try:
-                    import tempfile
-                    with tempfile.TemporaryDirectory() as tmpdir:
-                        tmp_blp = Path(tmpdir) / Path(blp_path).name
-                        shutil.copy2(blp_path, str(tmp_blp))
-                        result = subprocess.run(
-                            [self.blp_convert_path, "--to-png", str(tmp_blp)],
-                            capture_output=True, text=True, timeout=10,
-                        )
-                        output_png = tmp_blp.with_suffix(".png")
-                        if result.returncode != 0 or not output_png.exists():
-                            continue
-                        shutil.move(str(output_png), str(cached_png))
-                except Exception:
+                    cache_key = _texture_cache_key(blp_path, index)
+                except OSError as e:
+                    print(f"BLP convert failed for {norm}: {e}")
                     continue
-
+                cached_png = cache_dir / f"{cache_key}.png"
+                jobs[tex_name] = (norm, cached_png)
+                if not cached_png.exists() and not _decoded_path(cached_png).exists():
+                    to_convert.setdefault(cached_png, (norm, blp_path))
+            mat_tex.append((mat_idx, tex_name))
+        if index != stored_index:
+            _save_cache_index(cache_dir, index)
+
+        if to_convert:
+            with ThreadPoolExecutor(max_workers=min(len(to_convert), os.cpu_count() or 4)) as pool:
+                converting = {
+                    png: pool.submit(_convert_blp, self.blp_convert_path, blp_path, png, norm)
+                    for png, (norm, blp_path) in to_convert.items()
+                }
+                failed = {png for png, fut in converting.items() if not fut.result()}
+            jobs = {name: job for name, job in jobs.items() if job[1] not in failed}
+
+        # Names whose BLPs share content share a cache entry, and so one GL texture
+        by_png: dict[Path, int] = {}  # cached PNG -> GL tex id
+        loaded: dict[str, int] = {}  # filename -> GL tex id
+        for tex_name, (norm, cached_png) in jobs.items():
+            if cached_png in by_png:
+                loaded[tex_name] = by_png[cached_png]
+                continue
+            img_data = _decode_texture(cached_png, norm)
+            if img_data is None:
+                continue
             try:
-                img = Image.open(cached_png)
-                img = img.transpose(Image.FLIP_TOP_BOTTOM)
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-                img_data = np.array(img, dtype=np.uint8)
-
                 tex_id = gl.glGenTextures(1)
                 gl.glBindTexture(gl.GL_TEXTURE_2D, tex_id)
-                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, img.width, img.height,
-                                0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, img_data)
+                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, img_data.shape[1], img_data.shape[0],
+                                0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, np.ascontiguousarray(img_data))
                 gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
                 gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR_MIPMAP_LINEAR)
                 gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
                 gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_REPEAT)
                 gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_REPEAT)
 
-                loaded[tex_name] = tex_id
-                self._mat_textures[mat_idx] = tex_id
+                loaded[tex_name] = by_png[cached_png] = tex_id
             except Exception:
                 continue
 
+        for mat_idx, tex_name in mat_tex:
+            if tex_name in loaded:
+                self._mat_textures[mat_idx] = loaded[tex_name]
+
     def _compile_program(self, vert_src: str, frag_src: str) -> int:
         gl = self._gl
         vs = gl.glCreateShader(gl.GL_VERTEX_SHADER)
@@ -1806,74 +2690,47 @@ class WMORenderer:
         gl.glEnable(gl.GL_DEPTH_TEST)
         gl.glDisable(gl.GL_CULL_FACE)
 
-        gl.glUseProgram(self.shader)
-        mvp_loc = gl.glGetUniformLocation(self.shader, "uMVP")
-        model_loc = gl.glGetUniformLocation(self.shader, "uModel")
-        tex_loc = gl.glGetUniformLocation(self.shader, "uTexture")
-        has_tex_loc = gl.glGetUniformLocation(self.shader, "uHasTexture")
-        light_loc = gl.glGetUniformLocation(self.shader, "uLightDir")
-
-        gl.glUniformMatrix4fv(mvp_loc, 1, gl.GL_TRUE, mvp)
-        gl.glUniformMatrix4fv(model_loc, 1, gl.GL_TRUE, model)
-        gl.glUniform1i(tex_loc, 0)
-
-        light_dir = np.array([0.5, 0.3, 0.8], dtype=np.float32)
-        light_dir /= np.linalg.norm(light_dir)
-        gl.glUniform3fv(light_loc, 1, light_dir)
-
-        for gi in range(len(self._group_vaos)):
-            vao = self._group_vaos[gi]
-            n_idx = self._group_n_indices[gi]
-            batches = self._group_batches[gi]
-            if vao == 0 or n_idx == 0:
-                continue
+        # One upload of the frame block serves both the model and the wireframe program
+        frame = self._frame_data
+        frame[0:16] = mvp.ravel()
+        frame[16:32] = model.ravel()
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self.frame_ubo)
+        gl.glBufferSubData(gl.GL_UNIFORM_BUFFER, 0, 128, frame)
 
-            gl.glBindVertexArray(vao)
+        # Groups whose bounding box lies fully outside the view frustum are not submitted
+        visible = _aabbs_in_frustum(_extract_frustum_planes(mvp), *self._group_aabbs)
+        if visible.all():
+            visible = None
 
-            if batches:
-                for batch in batches:
-                    gl_tex = self._mat_textures.get(batch.material_id)
-                    if gl_tex:
-                        gl.glActiveTexture(gl.GL_TEXTURE0)
-                        gl.glBindTexture(gl.GL_TEXTURE_2D, gl_tex)
-                        gl.glUniform1i(has_tex_loc, 1)
-                    else:
-                        gl.glUniform1i(has_tex_loc, 0)
-
-                    si = batch.start_index
-                    ic = batch.index_count
-                    if si + ic <= n_idx:
-                        gl.glDrawElements(gl.GL_TRIANGLES, ic, gl.GL_UNSIGNED_SHORT,
-                                          gl.ctypes.c_void_p(si * 2))
-            else:
-                gl.glUniform1i(has_tex_loc, 0)
-                gl.glDrawElements(gl.GL_TRIANGLES, n_idx, gl.GL_UNSIGNED_SHORT,
-                                  gl.ctypes.c_void_p(0))
-
-            gl.glBindVertexArray(0)
-
-        # Wireframe overlay
-        if self.show_wireframe:
+        gl.glUseProgram(self.shader)
+        gl.glBindVertexArray(self.vao)
+        gl.glActiveTexture(gl.GL_TEXTURE0)
+        for gl_tex, draw in self._tex_draws:
+            args = self._cull(draw, visible)
+            if args is None:
+                continue
+            counts, offsets, bases = args
+            gl.glBindTexture(gl.GL_TEXTURE_2D, gl_tex)
+            gl.glMultiDrawElementsBaseVertex(gl.GL_TRIANGLES, counts, gl.GL_UNSIGNED_SHORT,
+                                             offsets, len(counts), bases)
+
+        # Wireframe overlay: every visible group in one multi-draw over the shared buffers
+        args = self._cull(self._wire_draw, visible) if self.show_wireframe else None
+        if args is not None:
+            counts, offsets, bases = args
             gl.glUseProgram(self.wire_shader)
-            wire_mvp_loc = gl.glGetUniformLocation(self.wire_shader, "uMVP")
-            gl.glUniformMatrix4fv(wire_mvp_loc, 1, gl.GL_TRUE, mvp)
             gl.glEnable(gl.GL_BLEND)
             gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
             gl.glPolygonMode(gl.GL_FRONT_AND_BACK, gl.GL_LINE)
 
-            for gi in range(len(self._group_vaos)):
-                vao = self._group_vaos[gi]
-                n_idx = self._group_n_indices[gi]
-                if vao == 0 or n_idx == 0:
-                    continue
-                gl.glBindVertexArray(vao)
-                gl.glDrawElements(gl.GL_TRIANGLES, n_idx, gl.GL_UNSIGNED_SHORT,
-                                  gl.ctypes.c_void_p(0))
-                gl.glBindVertexArray(0)
+            gl.glMultiDrawElementsBaseVertex(gl.GL_TRIANGLES, counts, gl.GL_UNSIGNED_SHORT,
+                                             offsets, len(counts), bases)
 
             gl.glPolygonMode(gl.GL_FRONT_AND_BACK, gl.GL_FILL)
             gl.glDisable(gl.GL_BLEND)
 
+        gl.glBindVertexArray(0)
+
 
 # ---------------------------------------------------------------------------
 # WMO Viewer Window
@@ -1896,6 +2753,13 @@ class WMOViewerWindow:
         self.running = True
         self.fps_clock = None
         self.font = None
+
+        # Persistent HUD texture, re-uploaded only when the text changes
+        self._hud_tex = 0
+        self._hud_size = (0, 0)
+        self._hud_lines: tuple[str, ...] | None = None
+        self._blitter: _QuadBlitter | None = None
+
         self._dragging = False
         self._panning = False
         self._last_mouse = (0, 0)
@@ -1911,16 +2775,19 @@ class WMOViewerWindow:
         self.parser = WMOParser()
 
         if self.wmo_root_path and Path(self.wmo_root_path).exists():
-            self.parser.parse_root(Path(self.wmo_root_path).read_bytes())
+            self.parser.parse_root(_map_file(self.wmo_root_path))
+
+        # Groups are independent: parse them concurrently, keeping file order
+        group_paths = [gp for gp in self.group_paths if Path(gp).exists()]
+        if group_paths:
+            with ThreadPoolExecutor(max_workers=min(len(group_paths), os.cpu_count() or 4)) as pool:
+                self.parser.groups.extend(pool.map(_parse_wmo_group, group_paths))
 
         total_verts = 0
         total_tris = 0
-        for gp in self.group_paths:
-            if Path(gp).exists():
-                group = self.parser.parse_group(Path(gp).read_bytes())
-                self.parser.groups.append(group)
-                total_verts += len(group.positions)
-                total_tris += len(group.indices) // 3
+        for group in self.parser.groups:
+            total_verts += len(group.positions)
+            total_tris += len(group.indices) // 3
 
         if total_verts == 0:
             print("No geometry found in WMO groups")
@@ -1955,6 +2822,10 @@ class WMOViewerWindow:
 
         gl.glClearColor(0.12, 0.12, 0.18, 1.0)
 
+        # Projection only changes on resize; the model transform is the identity
+        proj = perspective(45.0, self.width / max(self.height, 1), 0.1, 10000.0)
+        mvp = np.empty((4, 4), dtype=np.float32)
+
         while self.running:
             self.fps_clock.tick(60)
 
@@ -1965,6 +2836,7 @@ class WMOViewerWindow:
                     self.width, self.height = event.w, event.h
                     pygame.display.set_mode((self.width, self.height),
                                             DOUBLEBUF | OPENGL | RESIZABLE)
+                    perspective(45.0, self.width / max(self.height, 1), 0.1, 10000.0, out=proj)
                 elif event.type == KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.running = False
@@ -2001,13 +2873,10 @@ class WMOViewerWindow:
             gl.glViewport(0, 0, self.width, self.height)
             gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
 
-            aspect = self.width / max(self.height, 1)
-            proj = perspective(45.0, aspect, 0.1, 10000.0)
             view = self.camera.get_view_matrix()
-            model_mat = np.eye(4, dtype=np.float32)
-            mvp = proj @ view @ model_mat
+            np.matmul(proj, view, out=mvp)
 
-            self.renderer.render(mvp, model_mat)
+            self.renderer.render(mvp, _MODEL_IDENTITY)
 
             # HUD
             self._draw_hud(pygame, gl, total_verts, total_tris)
@@ -2030,6 +2899,18 @@ class WMOViewerWindow:
             "W: wireframe | Esc: quit",
         ]
 
+        # Most frames show the same text: reuse the uploaded texture as-is
+        if tuple(lines) != self._hud_lines:
+            self._hud_lines = tuple(lines)
+            self._upload_hud(pygame, gl, lines)
+        surf_width, total_height = self._hud_size
+        if self._blitter is None:
+            self._blitter = _QuadBlitter(gl)
+        self._blitter.draw(self._hud_tex, 8, self.height - total_height - 8, surf_width, total_height,
+                           self.width, self.height)
+
+    def _upload_hud(self, pygame, gl, lines: list[str]):
+        """Rasterize HUD lines and upload them into the persistent HUD texture."""
         line_height = 18
         total_height = len(lines) * line_height + 8
         surf_width = 420
@@ -2039,63 +2920,21 @@ class WMOViewerWindow:
             text_surf = self.font.render(line, True, (220, 220, 240))
             surf.blit(text_surf, (6, 4 + i * line_height))
 
-        text_data = pygame.image.tostring(surf, "RGBA", True)
-        tex_id = gl.glGenTextures(1)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, tex_id)
-        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, surf_width, total_height,
-                        0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, text_data)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
-
-        # Blit using the same approach as M2ViewerWindow
-        if not hasattr(self, '_blit_shader'):
-            blit_vert = """
-#version 330 core
-layout(location=0) in vec2 aPos;
-layout(location=1) in vec2 aUV;
-out vec2 vUV;
-void main() { gl_Position = vec4(aPos, 0.0, 1.0); vUV = aUV; }
-"""
-            blit_frag = """
-#version 330 core
-in vec2 vUV;
-uniform sampler2D uTex;
-out vec4 FragColor;
-void main() { FragColor = texture(uTex, vUV); }
-"""
-            self._blit_shader = self.renderer._compile_program(blit_vert, blit_frag)
-            self._blit_vao = gl.glGenVertexArrays(1)
-            self._blit_vbo = gl.glGenBuffers(1)
-
-        x, y, w, h = 8, self.height - total_height - 8, surf_width, total_height
-        x0 = 2.0 * x / self.width - 1.0
-        y0 = 2.0 * y / self.height - 1.0
-        x1 = 2.0 * (x + w) / self.width - 1.0
-        y1 = 2.0 * (y + h) / self.height - 1.0
-
-        quad = np.array([
-            x0, y0, 0, 0, x1, y0, 1, 0, x1, y1, 1, 1,
-            x0, y0, 0, 0, x1, y1, 1, 1, x0, y1, 0, 1,
-        ], dtype=np.float32)
-
-        gl.glBindVertexArray(self._blit_vao)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._blit_vbo)
-        gl.glBufferData(gl.GL_ARRAY_BUFFER, quad.nbytes, quad, gl.GL_DYNAMIC_DRAW)
-        gl.glVertexAttribPointer(0, 2, gl.GL_FLOAT, gl.GL_FALSE, 16, gl.ctypes.c_void_p(0))
-        gl.glEnableVertexAttribArray(0)
-        gl.glVertexAttribPointer(1, 2, gl.GL_FLOAT, gl.GL_FALSE, 16, gl.ctypes.c_void_p(8))
-        gl.glEnableVertexAttribArray(1)
-
-        gl.glDisable(gl.GL_DEPTH_TEST)
-        gl.glEnable(gl.GL_BLEND)
-        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
-        gl.glUseProgram(self._blit_shader)
-        gl.glUniform1i(gl.glGetUniformLocation(self._blit_shader, "uTex"), 0)
-        gl.glDrawArrays(gl.GL_TRIANGLES, 0, 6)
-        gl.glBindVertexArray(0)
-        gl.glEnable(gl.GL_DEPTH_TEST)
-        gl.glDisable(gl.GL_BLEND)
-        gl.glDeleteTextures(1, [tex_id])
+        # Top row first, as _QuadBlitter expects
+        text_data = pygame.image.tostring(surf, "RGBA", False)
+        if not self._hud_tex:
+            self._hud_tex = gl.glGenTextures(1)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, self._hud_tex)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self._hud_tex)
+        if (surf_width, total_height) != self._hud_size:
+            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, surf_width, total_height,
+                            0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, text_data)
+            self._hud_size = (surf_width, total_height)
+        else:
+            gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, 0, surf_width, total_height,
+                               gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, text_data)
 
 
 # ---------------------------------------------------------------------------
@@ -4,11 +4,31 @@ from __future__ import annotations
 
 import json
 import re
+import string
 from pathlib import Path
 from typing import Dict, Set
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
+
+# Reference definition of a valid opcode name; is_opcode_name() implements the
+# same check without going through the regex engine.
 RE_OPCODE_NAME = re.compile(r"^(?:CMSG|SMSG|MSG)_[A-Z0-9_]+$")
+_NAME_STRIP = str.maketrans("", "", string.ascii_uppercase + string.digits + "_")
+
+
+def is_opcode_name(name: str) -> bool:
+    if name.startswith(("CMSG_", "SMSG_")):
+        prefix = 5
+    elif name.startswith("MSG_"):
+        prefix = 4
+    else:
+        return False
+    return len(name) > prefix and not name.translate(_NAME_STRIP)
 
 
 def load_opcode_map(path: Path, _seen: Set[Path] | None = None) -> Dict[str, str]:
@@ -21,7 +41,7 @@ def load_opcode_map(path: Path, _seen: Set[Path] | None = None) -> Dict[str, str
         raise ValueError(f"Opcode map inheritance cycle: {chain}")
     _seen.add(path)
 
-    data = json.loads(path.read_text())
+    data = _loads(path.read_bytes())
     merged: Dict[str, str] = {}
 
     extends = data.get("_extends")
@@ -35,7 +55,7 @@ def load_opcode_map(path: Path, _seen: Set[Path] | None = None) -> Dict[str, str
                 merged.pop(name, None)
 
     for key, value in data.items():
-        if not isinstance(key, str) or not RE_OPCODE_NAME.match(key):
+        if not isinstance(key, str) or not is_opcode_name(key):
             continue
         if isinstance(value, str):
             merged[key] = value
@@ -3,50 +3,87 @@
 Validate opcode canonicalization and expansion mappings.
 
 Checks:
-1. Every enum opcode appears in kOpcodeNames.
-2. Every expansion JSON key resolves to a canonical opcode name (direct or alias).
-3. Every opcode referenced as Opcode::<NAME> in implementation code exists in each expansion map
+1. Every expansion JSON key resolves to a canonical opcode name (direct or alias).
+2. Every opcode referenced as Opcode::<NAME> in implementation code exists in each expansion map
    after alias canonicalization.
 """
 
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
+import mmap
+import os
 import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Set
+from typing import DefaultDict, Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple
 
-from opcode_map_utils import load_opcode_map
+from opcode_map_utils import is_opcode_name, load_opcode_map
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
-RE_OPCODE_NAME = re.compile(r"^(?:CMSG|SMSG|MSG)_[A-Z0-9_]+$")
-RE_CODE_REF = re.compile(r"\bOpcode::((?:CMSG|SMSG|MSG)_[A-Z0-9_]+)\b")
 
+# Bytes pattern: sources are scanned undecoded, after a cheap substring pre-filter.
+# The pattern must start with the literal so the engine can fast-search for it; a
+# leading \b would disable that, so the word boundary before "Opcode" is checked by a
+# lookbehind once the literal has matched (keeps e.g. LogicalOpcode:: from counting).
+RE_CODE_REF = re.compile(rb"Opcode::(?<![A-Za-z0-9_]Opcode::)((?:CMSG|SMSG|MSG)_[A-Z0-9_]+)\b")
 
-def read_canonical_data(path: Path) -> Set[str]:
-    data = json.loads(path.read_text())
+
+def read_canonical_data(path: Path) -> FrozenSet[str]:
+    data = _loads(path.read_bytes())
     names = data.get("logical_opcodes", [])
-    return {n for n in names if isinstance(n, str) and RE_OPCODE_NAME.match(n)}
+    # Opcode names are interned here and wherever else they enter the process, so the
+    # set/dict probes that compare them across sources mostly hit on identity.
+    return frozenset(
+        sys.intern(n) for n in names if isinstance(n, str) and is_opcode_name(n)
+    )
 
 
 def read_alias_data(path: Path) -> Dict[str, str]:
-    data = json.loads(path.read_text())
+    data = _loads(path.read_bytes())
     aliases = data.get("aliases", {})
     out: Dict[str, str] = {}
     for k, v in aliases.items():
-        if isinstance(k, str) and isinstance(v, str) and RE_OPCODE_NAME.match(k) and RE_OPCODE_NAME.match(v):
-            out[k] = v
+        if isinstance(k, str) and isinstance(v, str) and is_opcode_name(k) and is_opcode_name(v):
+            out[sys.intern(k)] = sys.intern(v)
     return out
 
 
-def canonicalize(name: str, aliases: Dict[str, str]) -> str:
-    seen: Set[str] = set()
-    current = name
-    while current in aliases and current not in seen:
-        seen.add(current)
-        current = aliases[current]
-    return current
+def resolve_aliases(aliases: Dict[str, str]) -> Dict[str, str]:
+    # Flatten the alias graph: every aliased name maps straight to the name its chain
+    # ends on, so canonicalizing is resolved.get(name, name). Each chain is walked once;
+    # names seen on the way are filled in too. Inside a cycle a name resolves to itself,
+    # and a chain leading into a cycle stops at the name where it enters it.
+    resolved: Dict[str, str] = {}
+    for start in aliases:
+        if start in resolved:
+            continue
+        path: List[str] = []
+        on_path: Dict[str, int] = {}
+        current = start
+        while current in aliases and current not in resolved and current not in on_path:
+            on_path[current] = len(path)
+            path.append(current)
+            current = aliases[current]
+        if current in on_path:
+            cycle_at = on_path[current]
+            for n in path[cycle_at:]:
+                resolved[n] = n
+            del path[cycle_at:]
+        target = resolved.get(current, current)
+        for n in path:
+            resolved[n] = target
+    return resolved
 
 
 def iter_expansion_files(expansions_dir: Path) -> Iterable[Path]:
@@ -56,28 +93,216 @@ def iter_expansion_files(expansions_dir: Path) -> Iterable[Path]:
 
 def load_expansion_names(path: Path) -> Dict[str, str]:
     data = load_opcode_map(path)
-    return {k: str(v) for k, v in data.items() if RE_OPCODE_NAME.match(k)}
+    return {sys.intern(k): str(v) for k, v in data.items() if is_opcode_name(k)}
+
+
+# Directory names never descended into: build output, vendored code, VCS and tool state
+SKIP_DIRS = frozenset({"build", "third_party", ".git", ".cache"})
+
+
+def _iter_source_files(root: Path) -> Iterator[str]:
+    """Yield src/**/*.cpp and include/**/*.hpp as path strings.
+
+    Walks each tree once with os.scandir, so file type checks reuse the directory
+    listing instead of stat()ing every entry through pathlib. Directories named in
+    SKIP_DIRS are pruned without being listed.
+    """
+    for subdir, suffix in (("src", ".cpp"), ("include", ".hpp")):
+        stack = [os.path.join(root, subdir)]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(suffix) and entry.is_file():
+                        yield entry.path
+
+
+def _scan_one(path: str) -> Set[str]:
+    # Map the file instead of reading it: the kernel only pages in what the
+    # pre-filter and regex touch, and nothing is copied onto the heap
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return set()
+    with mm:
+        # Most files never mention Opcode::; skip the regex for them
+        if mm.find(b"Opcode::") < 0:
+            return set()
+        return {m.group(1).decode("ascii") for m in RE_CODE_REF.finditer(mm)}
+
+
+# Bump when the scan changes what a file yields (pattern, pre-filter), so old caches are dropped
+REF_CACHE_VERSION = 1
+
+
+def _load_ref_cache(path: Path) -> Dict[str, list]:
+    """Read the ref cache: source path -> [mtime_ns, size, [refs]]."""
+    try:
+        data = _loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != REF_CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _cache_entry_matches(entry: object, st: os.stat_result) -> bool:
+    # Entries come from disk and may be hand-edited or from an older layout; anything
+    # that is not [mtime_ns, size, [refs...]] for this exact file is treated as stale.
+    return (
+        isinstance(entry, list)
+        and len(entry) == 3
+        and type(entry[0]) is int
+        and type(entry[1]) is int
+        and isinstance(entry[2], list)
+        and entry[0] == st.st_mtime_ns
+        and entry[1] == st.st_size
+        and all(isinstance(r, str) for r in entry[2])
+    )
 
 
-def collect_code_refs(root: Path) -> Set[str]:
-    refs: Set[str] = set()
-    skip_suffixes = {
-        "include/game/opcode_table.hpp",
-        "src/game/opcode_table.cpp",
-    }
-    for p in list(root.glob("src/**/*.cpp")) + list(root.glob("include/**/*.hpp")):
-        rel = p.as_posix()
-        if rel in skip_suffixes:
+def _save_ref_cache(path: Path, files: Dict[str, list]) -> None:
+    # Best effort: a read-only tree just means the next run scans everything again
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": REF_CACHE_VERSION, "files": files}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def collect_code_refs(root: Path, cache_path: Path | None = None) -> FrozenSet[str]:
+    skip_paths = frozenset({
+        os.path.join(root, "include", "game", "opcode_table.hpp"),
+        os.path.join(root, "src", "game", "opcode_table.cpp"),
+    })
+    cached = _load_ref_cache(cache_path) if cache_path is not None else {}
+    files: Dict[str, list] = {}
+    stale: List[str] = []
+    for p in _iter_source_files(root):
+        if p in skip_paths:
             continue
-        text = p.read_text(errors="ignore")
-        for m in RE_CODE_REF.finditer(text):
-            refs.add(m.group(1))
-    return refs
+        st = os.stat(p)
+        entry = cached.get(p)
+        if _cache_entry_matches(entry, st):
+            files[p] = entry
+        else:
+            files[p] = [st.st_mtime_ns, st.st_size, []]
+            stale.append(p)
+
+    if stale:
+        # Files are independent; threads overlap the reads (the GIL is released during I/O)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            for p, found in zip(stale, ex.map(_scan_one, stale)):
+                files[p][2] = sorted(found)
+    if cache_path is not None and (stale or len(files) != len(cached)):
+        _save_ref_cache(cache_path, files)
+
+    refs: Set[str] = set()
+    for _, _, found in files.values():
+        refs.update(found)
+    return frozenset(map(sys.intern, refs))
+
+
+# Problem reports list at most this many names; only that many are ever sorted
+SAMPLE_SIZE = 10
+
+
+@dataclass(frozen=True)
+class ExpansionReport:
+    raw: int
+    canonical: int
+    unknown: int
+    unknown_sample: List[str]
+    missing_required: int
+    missing_required_sample: List[str]
+    alias_collisions: int
+
+
+def _refs_outside(
+    code_refs_canonical: Dict[str, str], code_refs_canonical_values: FrozenSet[str], known: Set[str]
+) -> List[str]:
+    # Raw code refs whose canonical name is not in known. The check itself is one C-level
+    # set difference over canonical names; only its (usually empty) result is mapped back.
+    outside = code_refs_canonical_values - known
+    if not outside:
+        return []
+    return [r for r, c in code_refs_canonical.items() if c in outside]
+
+
+def _format_problem(label: str, count: int, sample: List[str]) -> str:
+    return f"{label}: {count} (sample: {sample})"
+
+
+# Below this many expansion maps the worker start-up costs more than it saves
+PARALLEL_MIN_EXPANSIONS = 8
+
+# Read-only inputs shared by every expansion check, set once per worker process
+_worker_state: Tuple[Dict[str, str], FrozenSet[str], Dict[str, str], FrozenSet[str]] = (
+    {}, frozenset(), {}, frozenset()
+)
+
+
+def _init_worker(
+    resolved: Dict[str, str],
+    enum_names: FrozenSet[str],
+    code_refs_canonical: Dict[str, str],
+    code_refs_canonical_values: FrozenSet[str],
+) -> None:
+    global _worker_state
+    _worker_state = (resolved, enum_names, code_refs_canonical, code_refs_canonical_values)
+
+
+def _process_expansion(exp_file: Path) -> ExpansionReport:
+    resolved, enum_names, code_refs_canonical, code_refs_canonical_values = _worker_state
+    names = load_expansion_names(exp_file)
+    canonical_names = {resolved.get(n, n) for n in names}
+    unknown = canonical_names - enum_names
+    missing_required = _refs_outside(
+        code_refs_canonical, code_refs_canonical_values, canonical_names
+    )
+
+    # Detect multiple raw names collapsing to one canonical name.
+    # Raw names are dict keys and therefore distinct, so a canonical collides as
+    # soon as its second raw name arrives.
+    collisions: DefaultDict[str, List[str]] = defaultdict(list)
+    colliding: Set[str] = set()
+    for raw in names:
+        c = resolved.get(raw, raw)
+        raws = collisions[c]
+        raws.append(raw)
+        if len(raws) == 2:
+            colliding.add(c)
+
+    return ExpansionReport(
+        raw=len(names),
+        canonical=len(canonical_names),
+        unknown=len(unknown),
+        unknown_sample=heapq.nsmallest(SAMPLE_SIZE, unknown),
+        missing_required=len(missing_required),
+        missing_required_sample=heapq.nsmallest(SAMPLE_SIZE, missing_required),
+        alias_collisions=len(colliding),
+    )
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--root", default=".")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rescan every source file instead of reusing .cache/opcode_refs.json.",
+    )
     parser.add_argument(
         "--strict-required",
         action="store_true",
@@ -92,73 +317,66 @@ def main() -> int:
 
     enum_names = read_canonical_data(canonical_path)
     aliases = read_alias_data(aliases_path)
-    k_names = set(enum_names)
-    code_refs = collect_code_refs(root)
+    resolved = resolve_aliases(aliases)
+    code_refs = collect_code_refs(root, None if args.no_cache else root / ".cache/opcode_refs.json")
+    # Canonical form of every code ref, resolved once and reused by each expansion
+    code_refs_canonical = {r: resolved.get(r, r) for r in code_refs}
+    code_refs_canonical_values = frozenset(code_refs_canonical.values())
 
     problems: List[str] = []
 
-    missing_in_name_map = sorted(enum_names - k_names)
-    if missing_in_name_map:
-        problems.append(
-            f"enum names missing from kOpcodeNames: {len(missing_in_name_map)} "
-            f"(sample: {missing_in_name_map[:10]})"
-        )
-
-    unknown_code_refs = sorted(r for r in code_refs if canonicalize(r, aliases) not in enum_names)
+    unknown_code_refs = _refs_outside(code_refs_canonical, code_refs_canonical_values, enum_names)
     if unknown_code_refs:
-        problems.append(
-            f"Opcode:: references not in enum/alias map: {len(unknown_code_refs)} "
-            f"(sample: {unknown_code_refs[:10]})"
-        )
+        problems.append(_format_problem(
+            "Opcode:: references not in enum/alias map",
+            len(unknown_code_refs),
+            heapq.nsmallest(SAMPLE_SIZE, unknown_code_refs),
+        ))
 
     print(f"Canonical enum names: {len(enum_names)}")
-    print(f"kOpcodeNames entries: {len(k_names)}")
     print(f"Alias entries: {len(aliases)}")
     print(f"Opcode:: code references: {len(code_refs)}")
 
-    for exp_file in iter_expansion_files(expansions_dir):
-        names = load_expansion_names(exp_file)
-        canonical_names = {canonicalize(n, aliases) for n in names}
-        unknown = sorted(n for n in canonical_names if n not in enum_names)
-        missing_required = sorted(
-            n for n in code_refs if canonicalize(n, aliases) not in canonical_names
-        )
-
-        # Detect multiple raw names collapsing to one canonical name.
-        collisions: Dict[str, List[str]] = {}
-        for raw in names:
-            c = canonicalize(raw, aliases)
-            collisions.setdefault(c, []).append(raw)
-        alias_collisions = sorted(
-            (c, raws) for c, raws in collisions.items() if len(raws) > 1 and len(set(raws)) > 1
-        )
-
-        print(
-            f"[{exp_file.parent.name}] raw={len(names)} canonical={len(canonical_names)} "
-            f"unknown={len(unknown)} missing_required={len(missing_required)} "
-            f"alias_collisions={len(alias_collisions)}"
-        )
-
-        if unknown:
-            problems.append(
-                f"{exp_file.parent.name}: unknown canonical names after aliasing: "
-                f"{len(unknown)} (sample: {unknown[:10]})"
-            )
-        if missing_required and args.strict_required:
-            problems.append(
-                f"{exp_file.parent.name}: missing required opcodes from implementation refs: "
-                f"{len(missing_required)} (sample: {missing_required[:10]})"
-            )
-        elif missing_required:
-            print(
+    exp_files = list(iter_expansion_files(expansions_dir))
+    shared = (resolved, enum_names, code_refs_canonical, code_refs_canonical_values)
+    if len(exp_files) >= PARALLEL_MIN_EXPANSIONS:
+        # Expansions are independent; spread the JSON load + checks across cores.
+        # map() keeps results in filename order so the report stays deterministic.
+        with ProcessPoolExecutor(initializer=_init_worker, initargs=shared) as ex:
+            results = list(ex.map(_process_expansion, exp_files))
+    else:
+        _init_worker(*shared)
+        results = [_process_expansion(p) for p in exp_files]
+
+    for exp_file, report in zip(exp_files, results):
+        # One write per expansion: header plus optional warn line
+        lines = [
+            f"[{exp_file.parent.name}] raw={report.raw} canonical={report.canonical} "
+            f"unknown={report.unknown} missing_required={report.missing_required} "
+            f"alias_collisions={report.alias_collisions}"
+        ]
+
+        if report.unknown:
+            problems.append(_format_problem(
+                f"{exp_file.parent.name}: unknown canonical names after aliasing",
+                report.unknown,
+                report.unknown_sample,
+            ))
+        if report.missing_required and args.strict_required:
+            problems.append(_format_problem(
+                f"{exp_file.parent.name}: missing required opcodes from implementation refs",
+                report.missing_required,
+                report.missing_required_sample,
+            ))
+        elif report.missing_required:
+            lines.append(
                 f"  warn: {exp_file.parent.name} missing required refs: "
-                f"{len(missing_required)} (sample: {missing_required[:6]})"
+                f"{report.missing_required} (sample: {report.missing_required_sample[:6]})"
             )
+        sys.stdout.write("\n".join(lines) + "\n")
 
     if problems:
-        print("\nFAILED:")
-        for p in problems:
-            print(f"- {p}")
+        sys.stdout.write("\nFAILED:\n" + "".join(f"- {p}\n" for p in problems))
         return 1
 
     print("\nOK: canonical opcode contract satisfied across expansions.")